@@ -0,0 +1,63 @@
+"""Synthetic draft corpora for the benchmarks."""
+import datetime
+import os
+import random
+
+WORDS = (
+    "the of and to a in is it you that he was for on are with as I his they be at one "
+    "have this from or had by hot word but what some we can out other were all there "
+    "when up use your how said an each she which do their time if will way about many "
+    "then them write would like so these her long make thing see him two has look more "
+    "day could go come did number sound no most people my over know water than call "
+    "first who may down side been now find any new work part take get place made live "
+    "where after back little only round man year came show every good me give our under "
+    "morning coffee window rain quiet garden letter memory river doubt promise winter"
+).split()
+
+
+def make_text(words, rng):
+    """About `words` words of plain prose, with a paragraph break now and then."""
+    out = []
+    for i in range(words):
+        out.append(rng.choice(WORDS))
+        if i % 120 == 119:
+            out.append("\n\n")
+        elif i % 12 == 11:
+            out.append(".")
+    return " ".join(out)
+
+
+def generate(drafts_dir, count, mean_words=600, sigma=0.8, seed=0, start=None):
+    """Write count freewrite_<timestamp>.txt drafts into drafts_dir.
+
+    Draft lengths are log-normal with mean mean_words, which
+    gives the usual mix of short entries and the odd very long one. The
+    same seed always produces the same corpus. Returns the total bytes.
+    """
+    rng = random.Random(seed)
+    os.makedirs(drafts_dir, exist_ok=True)
+    when = start or datetime.datetime(2024, 1, 1, 8, 0, 0)
+    total = 0
+    for _ in range(count):
+        when += datetime.timedelta(minutes=rng.randint(20, 60 * 24))
+        words = max(1, int(rng.lognormvariate(-sigma * sigma / 2, sigma) * mean_words))
+        text = make_text(words, rng)
+        name = f"freewrite_{when:%Y%m%d-%H%M%S}.txt"
+        with open(os.path.join(drafts_dir, name), 'w', encoding='utf-8') as f:
+            f.write(text)
+        total += len(text.encode('utf-8'))
+    return total
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Generate a synthetic drafts directory.")
+    parser.add_argument("drafts_dir")
+    parser.add_argument("-n", "--count", type=int, default=1000)
+    parser.add_argument("--mean-words", type=int, default=600)
+    parser.add_argument("--sigma", type=float, default=0.8)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    size = generate(args.drafts_dir, args.count, args.mean_words, args.sigma, args.seed)
+    print(f"Wrote {args.count} drafts ({size / 1e6:.1f} MB) to {args.drafts_dir}")
@@ -0,0 +1,240 @@
+"""Benchmarks for the editor's hot paths, reported as JSON.
+
+    python -m benchmarks.run --out bench.json        # full run
+    python -m benchmarks.run --quick                 # smaller sizes, to stdout
+    xvfb-run python -m benchmarks.run --tk           # include a real Text widget
+
+Everything but --tk runs headless against freewrite.core. Compare two
+result files key by key to spot regressions between commits.
+"""
+import argparse
+import datetime
+import json
+import os
+import platform
+import random
+import shutil
+import sqlite3
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+from benchmarks.corpus import WORDS, generate, make_text
+from freewrite.core import HistoryIndex
+from freewrite.journal import SessionJournal
+from freewrite.persistence import atomic_write
+from freewrite.wordcount import WordCounter, count_words
+
+FULL = {
+    "doc_chars": [1_000, 10_000, 100_000, 1_000_000],
+    "drafts": [100, 1_000, 5_000],
+    "keystrokes": 2_000,
+    "queries": 200,
+    "autosaves": 50,
+}
+QUICK = {
+    "doc_chars": [1_000, 100_000],
+    "drafts": [50, 500],
+    "keystrokes": 300,
+    "queries": 40,
+    "autosaves": 10,
+}
+
+
+def summarize(samples):
+    """min/median/p95/max of per-call timings, in microseconds."""
+    samples = sorted(samples)
+    return {
+        "n": len(samples),
+        "min_us": round(samples[0] * 1e6, 2),
+        "median_us": round(statistics.median(samples) * 1e6, 2),
+        "p95_us": round(samples[min(len(samples) - 1, int(len(samples) * 0.95))] * 1e6, 2),
+        "max_us": round(samples[-1] * 1e6, 2),
+    }
+
+
+def timed(func, repeat):
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        samples.append(time.perf_counter() - start)
+    return summarize(samples)
+
+
+def document(chars, seed=0):
+    rng = random.Random(seed)
+    text = make_text(chars // 4, rng)
+    while len(text) < chars:
+        text += " " + make_text(chars // 4, rng)
+    return text[:chars]
+
+
+def bench_keystroke(config, use_tk=False):
+    """Cost of keeping the word count current after one typed character."""
+    results = []
+    for chars in config["doc_chars"]:
+        text = document(chars)
+        counter = WordCounter(text)
+        keys = iter(random.Random(chars).choices("etaoin shrdlu", k=config["keystrokes"]))
+        row = {
+            "doc_chars": chars,
+            # What update_word_count costs now: one delta per edit.
+            "incremental": timed(lambda: counter.insert(text[-1], next(keys), ""), config["keystrokes"]),
+            # What it used to cost: re-splitting the whole document.
+            "full_recount": timed(lambda: count_words(text), max(5, config["keystrokes"] // 100)),
+        }
+        if use_tk:
+            row["tk_widget"] = bench_tk_keystroke(text, config["keystrokes"])
+        results.append(row)
+    return results
+
+
+def bench_tk_keystroke(text, keystrokes):
+    """One insert into a real Text widget with a TextWidgetCounter attached."""
+    import tkinter as tk
+    from freewrite.wordcount import TextWidgetCounter
+
+    try:
+        root = tk.Tk()
+    except tk.TclError as e:
+        return {"skipped": f"no display: {e}"}
+    try:
+        root.withdraw()
+        widget = tk.Text(root)
+        widget.insert("1.0", text)
+        counter = TextWidgetCounter(widget)
+        result = timed(lambda: widget.insert("end-1c", "a"), keystrokes)
+        counter.detach()
+        return result
+    finally:
+        root.destroy()
+
+
+def bench_history(config, workdir, seed):
+    """load_history_files (index refresh + first page) and search latency."""
+    history, search = [], []
+    rng = random.Random(seed)
+    for count in config["drafts"]:
+        drafts_dir = os.path.join(workdir, f"drafts-{count}")
+        corpus_bytes = generate(drafts_dir, count, seed=seed)
+
+        first_page = []
+        start = time.perf_counter()
+        index = HistoryIndex(drafts_dir)
+        index.refresh(on_first_page=lambda: first_page.append(time.perf_counter() - start))
+        index.entries()
+        cold = time.perf_counter() - start
+        index.close()
+
+        start = time.perf_counter()
+        index = HistoryIndex(drafts_dir)
+        index.refresh()
+        index.entries()
+        warm = time.perf_counter() - start
+
+        history.append({
+            "drafts": count,
+            "corpus_bytes": corpus_bytes,
+            "cold_s": round(cold, 4),
+            "cold_first_page_s": round(first_page[0] if first_page else cold, 4),
+            "warm_s": round(warm, 4),
+        })
+
+        queries = []
+        for _ in range(config["queries"]):
+            words = rng.sample(WORDS, rng.choice((1, 1, 2, 3)))
+            words[-1] = words[-1][:max(2, len(words[-1]) - 1)]
+            queries.append(" ".join(words))
+        pending = iter(queries)
+        search.append({
+            "drafts": count,
+            "fts5": index.has_fts5,
+            "search": timed(lambda: index.search(next(pending)), len(queries)),
+        })
+        index.close()
+    return history, search
+
+
+def bench_autosave(config, workdir):
+    """One autosave after a word is added, journal append vs full rewrite."""
+    results = []
+    for chars in config["doc_chars"]:
+        drafts_dir = os.path.join(workdir, f"autosave-{chars}")
+        journal = SessionJournal(drafts_dir)
+        text = document(chars)
+        journal.append(text)
+        path = os.path.join(drafts_dir, "full.txt")
+
+        def journal_append():
+            nonlocal text
+            text += " word"
+            journal.append(text)
+
+        results.append({
+            "doc_chars": chars,
+            "journal_append": timed(journal_append, config["autosaves"]),
+            "atomic_rewrite": timed(lambda: atomic_write(path, text), config["autosaves"]),
+            "atomic_rewrite_fsync": timed(lambda: atomic_write(path, text, fsync=True),
+                                          max(3, config["autosaves"] // 5)),
+        })
+    return results
+
+
+def git_commit():
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"],
+                             capture_output=True, text=True, check=True)
+        return out.stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run(config, use_tk=False, seed=0, workdir=None):
+    own_workdir = workdir is None
+    workdir = workdir or tempfile.mkdtemp(prefix="freewrite-bench-")
+    try:
+        history, search = bench_history(config, workdir, seed)
+        return {
+            "meta": {
+                "commit": git_commit(),
+                "date": datetime.datetime.now().isoformat(timespec="seconds"),
+                "python": platform.python_version(),
+                "platform": platform.platform(),
+                "sqlite": sqlite3.sqlite_version,
+                "seed": seed,
+                "config": config,
+            },
+            "keystroke": bench_keystroke(config, use_tk),
+            "history_load": history,
+            "search": search,
+            "autosave": bench_autosave(config, workdir),
+        }
+    finally:
+        if own_workdir:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run the freewrite benchmarks.")
+    parser.add_argument("--quick", action="store_true", help="smaller sizes for a fast check")
+    parser.add_argument("--tk", action="store_true", help="also time a real Text widget (needs a display)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workdir", help="keep generated corpora here instead of a temp dir")
+    parser.add_argument("--out", help="write JSON here instead of stdout")
+    args = parser.parse_args(argv)
+
+    results = run(QUICK if args.quick else FULL, args.tk, args.seed, args.workdir)
+    if args.out:
+        with open(args.out, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+            f.write("\n")
+    else:
+        json.dump(results, sys.stdout, indent=2)
+        sys.stdout.write("\n")
+
+
+if __name__ == "__main__":
+    main()
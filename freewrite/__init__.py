@@ -0,0 +1 @@
+"""Support modules for the Freewrite app (main.py holds the Tk UI)."""
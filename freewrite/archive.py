@@ -0,0 +1,114 @@
+"""Per-month compressed archives for old drafts."""
+import datetime
+import os
+import shutil
+import tempfile
+import threading
+import zipfile
+
+from freewrite.persistence import fsync_directory
+
+
+class ArchiveStat:
+    """The bits of os.stat_result the history index looks at."""
+
+    __slots__ = ("st_size", "st_mtime_ns")
+
+    def __init__(self, info):
+        self.st_size = info.file_size
+        mtime = datetime.datetime(*info.date_time).timestamp()
+        self.st_mtime_ns = int(mtime * 1_000_000_000)
+
+
+class DraftArchive:
+    """Old drafts packed into drafts/.archive/YYYY-MM.zip (LZMA members).
+
+    The zip central directory is the member index: finding or extracting a
+    single draft reads that directory and one compressed member, never the
+    whole archive. The name -> archive map is built from the directories
+    once and kept up to date as drafts are added.
+    """
+
+    def __init__(self, drafts_dir="drafts"):
+        self.archive_dir = os.path.join(drafts_dir, ".archive")
+        self.lock = threading.Lock()
+        self.members = {}
+        if os.path.isdir(self.archive_dir):
+            for name in sorted(os.listdir(self.archive_dir)):
+                if name.endswith(".zip"):
+                    self._load(os.path.join(self.archive_dir, name))
+
+    def _load(self, path):
+        try:
+            with zipfile.ZipFile(path) as zf:
+                for info in zf.infolist():
+                    self.members[info.filename] = (path, info)
+        except (OSError, zipfile.BadZipFile) as e:
+            print(f"Could not read archive {path}: {e}")
+
+    def __contains__(self, name):
+        with self.lock:
+            return name in self.members
+
+    def names(self):
+        with self.lock:
+            return list(self.members)
+
+    def stat(self, name):
+        with self.lock:
+            member = self.members.get(name)
+        if member is None:
+            raise FileNotFoundError(name)
+        return ArchiveStat(member[1])
+
+    def open(self, name):
+        """Binary file object for one archived draft."""
+        with self.lock:
+            member = self.members.get(name)
+        if member is None:
+            raise FileNotFoundError(name)
+        # The member stream keeps the file open after the ZipFile closes.
+        with zipfile.ZipFile(member[0]) as zf:
+            return zf.open(member[1])
+
+    def add(self, month, items):
+        """Pack (name, source_path) pairs into the archive for month.
+
+        The month's zip is rebuilt in a temp file (existing members plus the
+        new ones), fsynced and renamed over the old one, so a crash leaves
+        either the old archive or the new one, never a torn one. Returns the
+        names now safely archived; the caller removes sources.
+        """
+        os.makedirs(self.archive_dir, exist_ok=True)
+        path = os.path.join(self.archive_dir, f"{month}.zip")
+        fd, tmp_path = tempfile.mkstemp(dir=self.archive_dir, prefix=".tmp-", suffix=".part")
+        added = []
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                with zipfile.ZipFile(f, 'w', compression=zipfile.ZIP_LZMA, strict_timestamps=False) as out:
+                    existing = set()
+                    if os.path.exists(path):
+                        with zipfile.ZipFile(path) as old:
+                            for info in old.infolist():
+                                with old.open(info) as src, out.open(info, 'w') as dst:
+                                    shutil.copyfileobj(src, dst)
+                                existing.add(info.filename)
+                    for name, source in items:
+                        if name not in existing:
+                            out.write(source, arcname=name)
+                        added.append(name)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, path)
+        except BaseException:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            raise
+        fsync_directory(self.archive_dir)
+        with zipfile.ZipFile(path) as zf:
+            with self.lock:
+                for info in zf.infolist():
+                    self.members[info.filename] = (path, info)
+        return added
@@ -0,0 +1,145 @@
+"""Full and incremental backups of every draft into one .tar.gz."""
+import codecs
+import collections
+import datetime
+import gzip
+import hashlib
+import io
+import json
+import multiprocessing
+import os
+import tarfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from freewrite.history_index import iter_drafts, parse_draft_date
+from freewrite.wordcount import StreamWordCounter
+
+CHUNK_BYTES = 1 << 20
+
+
+def _compress(chunk, level):
+    return gzip.compress(chunk, compresslevel=level)
+
+
+class ParallelGzipWriter:
+    """File-like sink that gzips 1 MiB chunks in a process pool.
+
+    Every chunk becomes its own gzip member and members are written in
+    order; concatenated members are a valid gzip stream, so the result
+    opens with gzip/tarfile like any other .tar.gz.
+    """
+
+    def __init__(self, out, pool, max_pending, level=6):
+        self.out = out
+        self.pool = pool
+        self.level = level
+        self.max_pending = max_pending
+        self.buffer = bytearray()
+        self.pending = collections.deque()
+
+    def write(self, data):
+        self.buffer += data
+        while len(self.buffer) >= CHUNK_BYTES:
+            self._submit(bytes(self.buffer[:CHUNK_BYTES]))
+            del self.buffer[:CHUNK_BYTES]
+        return len(data)
+
+    def _submit(self, chunk):
+        self.pending.append(self.pool.submit(_compress, chunk, self.level))
+        while len(self.pending) > self.max_pending:
+            self.out.write(self.pending.popleft().result())
+
+    def close(self):
+        if self.buffer:
+            self._submit(bytes(self.buffer))
+            self.buffer.clear()
+        while self.pending:
+            self.out.write(self.pending.popleft().result())
+
+
+class _DigestReader:
+    """Wraps a binary stream, hashing and counting words as tarfile reads it."""
+
+    def __init__(self, stream):
+        self.stream = stream
+        self.sha256 = hashlib.sha256()
+        self.decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+        self.words = StreamWordCounter()
+
+    def read(self, size=-1):
+        data = self.stream.read(size)
+        self.sha256.update(data)
+        self.words.feed(self.decoder.decode(data, final=not data))
+        return data
+
+
+def load_manifest(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def backup_drafts(target_path, store, drafts_dir="drafts", base_manifest=None,
+                  workers=None, progress=None):
+    """Write every draft (or only changed ones) into target_path (.tar.gz).
+
+    With base_manifest (a manifest dict from an earlier backup) only drafts
+    whose size or mtime changed since then are included. The returned
+    manifest maps every current draft to its sha256, word count, date,
+    size and mtime, and records which ones this archive holds; it is also
+    stored in the archive as manifest.json.
+
+    progress(done, total) is called from the calling thread.
+    """
+    previous = (base_manifest or {}).get("drafts", {})
+    entries = list(iter_drafts(drafts_dir, store))
+    entries.reverse()
+    todo = []
+    drafts = {}
+    for entry in entries:
+        st = entry.stat()
+        old = previous.get(entry.name)
+        if old and old["size"] == st.st_size and old["mtime_ns"] == st.st_mtime_ns:
+            drafts[entry.name] = dict(old, included=False)
+        else:
+            todo.append((entry.name, st))
+
+    total = len(todo)
+    workers = workers or os.cpu_count() or 1
+    # Spawned workers never inherit the Tk interpreter or its threads.
+    context = multiprocessing.get_context("spawn")
+    with open(target_path, 'wb') as out, \
+            ProcessPoolExecutor(max_workers=workers, mp_context=context) as pool:
+        sink = ParallelGzipWriter(out, pool, max_pending=2 * workers)
+        with tarfile.open(fileobj=sink, mode='w|', format=tarfile.PAX_FORMAT) as tar:
+            for done, (name, st) in enumerate(todo, 1):
+                info = tarfile.TarInfo("drafts/" + name)
+                info.size = st.st_size
+                info.mtime = st.st_mtime_ns / 1e9
+                with store.open_binary(name) as stream:
+                    reader = _DigestReader(stream)
+                    tar.addfile(info, reader)
+                created = parse_draft_date(name)
+                drafts[name] = {
+                    "sha256": reader.sha256.hexdigest(),
+                    "words": reader.words.count,
+                    "date": created.isoformat() if created else None,
+                    "size": st.st_size,
+                    "mtime_ns": st.st_mtime_ns,
+                    "included": True,
+                }
+                if progress:
+                    progress(done, total)
+            manifest = {
+                "created": datetime.datetime.now().isoformat(timespec="seconds"),
+                "incremental": base_manifest is not None,
+                "base": (base_manifest or {}).get("created"),
+                "drafts": drafts,
+            }
+            data = json.dumps(manifest, indent=1).encode('utf-8')
+            info = tarfile.TarInfo("manifest.json")
+            info.size = len(data)
+            info.mtime = time.time()
+            tar.addfile(info, io.BytesIO(data))
+        sink.close()
+    return manifest
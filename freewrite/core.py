@@ -0,0 +1,348 @@
+"""UI-free session engine: timer, word count, autosave and history access.
+
+Nothing here imports tkinter, so the hot paths can be driven, profiled
+and load-tested from plain Python. The Tk app subscribes to Session
+events and draws what they report.
+"""
+import math
+import time
+
+from freewrite.draft_store import DraftStore
+from freewrite.wordcount import WordCounter
+
+__all__ = [
+    "Autosaver",
+    "DraftStore",
+    "EventEmitter",
+    "HistoryIndex",
+    "HistorySearch",
+    "ManualClock",
+    "Session",
+    "SessionTimer",
+    "iter_drafts",
+]
+
+
+def __getattr__(name):
+    # The history index pulls in sqlite3; load it when it is first used
+    # rather than on every import of the core.
+    if name in ("HistoryIndex", "HistorySearch", "iter_drafts"):
+        from freewrite import history_index
+        return getattr(history_index, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+class ManualClock:
+    """Deterministic clock for tests and benchmarks; call advance()."""
+
+    def __init__(self, now=0.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+    def advance(self, seconds):
+        self.now += seconds
+        return self.now
+
+
+class EventEmitter:
+    """Minimal publish/subscribe: subscribe(event, callback), emit(event, ...)."""
+
+    def __init__(self):
+        self._subscribers = {}
+
+    def subscribe(self, event, callback):
+        self._subscribers.setdefault(event, []).append(callback)
+        return callback
+
+    def unsubscribe(self, event, callback):
+        self._subscribers.get(event, []).remove(callback)
+
+    def emit(self, event, *args):
+        for callback in self._subscribers.get(event, ()):
+            callback(*args)
+
+
+class Autosaver:
+    """Saves a dirty document once typing pauses, without ever polling.
+
+    mark_dirty() is called for every edit. The first edit after a save arms
+    one timer; when it fires, save() runs if typing has been idle for
+    idle_ms or the oldest unsaved edit is max_latency_ms old, otherwise the
+    timer is re-armed for whichever comes first. A clean document has no
+    timer at all.
+    """
+
+    def __init__(self, save, schedule, cancel, idle_ms=2000, max_latency_ms=30000,
+                 clock=time.monotonic):
+        self.save = save
+        self.schedule = schedule
+        self.cancel = cancel
+        self.idle_ms = idle_ms
+        self.max_latency_ms = max_latency_ms
+        self.clock = clock
+        self.dirty = False
+        self.dirty_since = None
+        self.last_edit = None
+        self.after_id = None
+
+    def mark_dirty(self):
+        now = self.clock()
+        self.last_edit = now
+        if not self.dirty:
+            self.dirty = True
+            self.dirty_since = now
+            self._arm(self.idle_ms)
+
+    def mark_clean(self):
+        if self.after_id is not None:
+            self.cancel(self.after_id)
+            self.after_id = None
+        self.dirty = False
+
+    def flush(self):
+        """Save now if there is anything unsaved."""
+        dirty = self.dirty
+        self.mark_clean()
+        if dirty:
+            self.save()
+
+    def _arm(self, delay_ms):
+        self.after_id = self.schedule(max(1, math.ceil(delay_ms)), self._fire)
+
+    def _fire(self):
+        self.after_id = None
+        if not self.dirty:
+            return
+        due = min(self.last_edit + self.idle_ms / 1000, self.dirty_since + self.max_latency_ms / 1000)
+        now = self.clock()
+        if now < due:
+            self._arm((due - now) * 1000)
+        else:
+            self.flush()
+
+
+class SessionTimer:
+    """Drives Session.tick() with a scheduler such as root.after.
+
+    Each tick is scheduled for the moment the displayed remaining time
+    changes, not a fixed second after the previous callback, so callback
+    latency never accumulates. Nothing is scheduled while the session is
+    paused, stopped or reset. schedule(ms, func) must return an id that
+    cancel(id) accepts.
+    """
+
+    def __init__(self, session, schedule, cancel):
+        self.session = session
+        self.schedule = schedule
+        self.cancel = cancel
+        self.after_id = None
+        for event in ("started", "resumed", "restarted"):
+            session.subscribe(event, self._reschedule)
+        for event in ("paused", "reset"):
+            session.subscribe(event, self.stop)
+
+    def stop(self):
+        if self.after_id is not None:
+            self.cancel(self.after_id)
+            self.after_id = None
+
+    def _reschedule(self):
+        self.stop()
+        if self.session.running and not self.session.paused:
+            delay_ms = max(1, math.ceil(self.session.next_tick_delay() * 1000))
+            self.after_id = self.schedule(delay_ms, self._fire)
+
+    def _fire(self):
+        self.after_id = None
+        # times_up handlers may extend() the session, which reschedules.
+        if self.session.tick():
+            self._reschedule()
+
+
+class Session(EventEmitter):
+    """State of one freewriting session.
+
+    Time is measured on a monotonic clock, so wall-clock jumps (NTP, sleep
+    and resume) never change the remaining time. Paused intervals are
+    simply not added to the elapsed total.
+
+    Events:
+        started, paused, resumed, reset   no arguments
+        restarted                         timer went back to a full length
+        tick(remaining_seconds)           from tick() while the timer runs
+        times_up                          when the timer reaches zero
+        words(count)                      after every counted edit
+        autosaved                         after a journal record is queued
+    """
+
+    def __init__(self, length_minutes=15, clock=time.monotonic, counter=None, journal=None,
+                 keystrokes=None):
+        super().__init__()
+        self.clock = clock
+        self.length_minutes = length_minutes
+        self.counter = counter if counter is not None else WordCounter()
+        if hasattr(self.counter, "add_listener"):
+            # A TextWidgetCounter is fed by the widget itself.
+            self.counter.add_listener(lambda op, index, text: self.emit("words", self.counter.count))
+        self.journal = journal
+        self.keystrokes = keystrokes
+        self.timer_started = False
+        self.running = False
+        self.paused = False
+        self.elapsed_before = 0.0
+        self.resumed_at = None
+
+    # Timer
+
+    def start(self):
+        """Start the timer if it hasn't been started yet."""
+        if self.timer_started:
+            return False
+        self.timer_started = True
+        self.running = True
+        self.resumed_at = self.clock()
+        self.emit("started")
+        return True
+
+    def elapsed(self):
+        """Seconds the timer has run, not counting pauses."""
+        if self.resumed_at is None:
+            return self.elapsed_before
+        return self.elapsed_before + (self.clock() - self.resumed_at)
+
+    def remaining(self):
+        """Whole seconds left in the session."""
+        return max(0, self.length_minutes * 60 - int(self.elapsed()))
+
+    def next_tick_delay(self):
+        """Seconds until the displayed remaining time next changes."""
+        elapsed = self.elapsed()
+        return math.floor(elapsed) + 1 - elapsed
+
+    def tick(self):
+        """Advance the timer; returns the remaining seconds or None if stopped."""
+        if not self.running:
+            return None
+        remaining = self.remaining()
+        if self.paused:
+            return remaining
+        if remaining <= 0:
+            self.running = False
+            self.elapsed_before = self.elapsed()
+            self.resumed_at = None
+            self.emit("times_up")
+            return 0
+        self.emit("tick", remaining)
+        return remaining
+
+    def toggle_pause(self):
+        if not self.timer_started:
+            return
+        self.paused = not self.paused
+        if self.paused:
+            self.elapsed_before = self.elapsed()
+            self.resumed_at = None
+            self.emit("paused")
+        else:
+            self.resumed_at = self.clock()
+            self.emit("resumed")
+
+    def set_length(self, minutes):
+        """Change the session length; a started timer starts over."""
+        self.length_minutes = minutes
+        if self.timer_started:
+            self.elapsed_before = 0.0
+            self.resumed_at = None if self.paused else self.clock()
+            self.emit("restarted")
+
+    def extend(self):
+        """Keep writing after time is up: run another full session length."""
+        self.paused = False
+        self.running = True
+        self.elapsed_before = 0.0
+        self.resumed_at = self.clock()
+        self.emit("restarted")
+
+    def timer_state(self):
+        return {
+            "length_minutes": self.length_minutes,
+            "elapsed": self.elapsed(),
+            "started": self.timer_started,
+        }
+
+    def restore_timer(self, state):
+        """Pick up a timer saved by timer_state(); it resumes on start()."""
+        self.reset()
+        self.length_minutes = state.get("length_minutes", self.length_minutes)
+        if state.get("started"):
+            self.elapsed_before = min(float(state.get("elapsed", 0.0)), self.length_minutes * 60)
+
+    def reset(self):
+        self.timer_started = False
+        self.running = False
+        self.paused = False
+        self.elapsed_before = 0.0
+        self.resumed_at = None
+        self.emit("reset")
+
+    # Words
+
+    @property
+    def word_count(self):
+        return self.counter.count
+
+    def insert(self, prev, text, next_char):
+        """Feed an edit to the counter (the Tk layer's counter does this itself)."""
+        self.counter.insert(prev, text, next_char)
+        self.emit("words", self.counter.count)
+
+    def delete(self, prev, text, next_char):
+        self.counter.delete(prev, text, next_char)
+        self.emit("words", self.counter.count)
+
+    def keystroke(self):
+        """Note a typed character for the typing-rhythm stats."""
+        if self.keystrokes is not None:
+            self.keystrokes.record()
+
+    def typing_stats(self):
+        return self.keystrokes.stats() if self.keystrokes is not None else None
+
+    # Persistence
+
+    def autosave(self, text):
+        """Queue a journal record for text; returns False if nothing changed.
+
+        Nothing is journaled before the timer has started, i.e. before the
+        user has typed: text that was only loaded or restored is already a
+        draft and must not become another one.
+        """
+        if self.journal is None or not self.timer_started or not text.strip():
+            return False
+        if self.journal.append(text):
+            self._attach_keystrokes()
+            self.emit("autosaved")
+            return True
+        return False
+
+    def _attach_keystrokes(self):
+        if self.keystrokes is not None and self.journal.path is not None:
+            self.keystrokes.attach(self.journal.path)
+
+    def finish(self, text):
+        """Compact the journal into a snapshot; returns its path or None.
+
+        Keystroke timings are moved next to the snapshot.
+        """
+        snapshot = None
+        if self.journal is not None:
+            # A resumed journal's timings go with it even if none were typed now.
+            self._attach_keystrokes()
+            snapshot = self.journal.finish(text)
+        if self.keystrokes is not None:
+            # A snapshot identical to the last one is not stored again.
+            journal = self.journal
+            self.keystrokes.finish(snapshot, stored=lambda: journal.last_stored == snapshot)
+        return snapshot
@@ -0,0 +1,220 @@
+"""Opt-in latency histograms for Tk event handlers and after() callbacks.
+
+Set FREEWRITE_DIAGNOSTICS=1 (or to a .json path) before starting the app.
+When it is unset nothing is patched and handlers run exactly as bound, so
+the disabled cost is one environment lookup at startup.
+
+FREEWRITE_STARTUP_TRACE=1 separately times the phases of startup.
+"""
+import json
+import math
+import os
+import sys
+import time
+from array import array
+
+BASE_US = 16
+STEPS_PER_DOUBLING = 4
+BUCKETS = 81  # 16 us .. ~16 s
+DEFAULT_DUMP_PATH = "freewrite-diagnostics.json"
+# main.py imports this module first, so this is close to process start.
+IMPORTED_AT = time.perf_counter()
+
+
+def bucket_bound_us(index):
+    """Upper bound of a histogram bucket, in microseconds."""
+    return BASE_US * 2 ** (index / STEPS_PER_DOUBLING)
+
+
+def callback_name(func):
+    return getattr(func, "__qualname__", None) or repr(func)
+
+
+class LatencyHistogram:
+    """Call latencies in fixed log-scale buckets (about 19% wide).
+
+    Recording is one log2 and one array increment. Percentiles are reported
+    as the upper bound of the bucket they fall in.
+    """
+
+    __slots__ = ("counts", "count", "total", "max")
+
+    def __init__(self):
+        self.counts = array('Q', bytes(8 * BUCKETS))
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def record(self, seconds):
+        us = seconds * 1e6
+        if us <= BASE_US:
+            index = 0
+        else:
+            index = min(BUCKETS - 1, math.ceil(STEPS_PER_DOUBLING * math.log2(us / BASE_US)))
+        self.counts[index] += 1
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def percentile(self, p):
+        """Latency in seconds below which p percent of calls finished."""
+        if not self.count:
+            return 0.0
+        rank = max(1, math.ceil(self.count * p / 100))
+        seen = 0
+        for index, n in enumerate(self.counts):
+            seen += n
+            if seen >= rank:
+                return min(bucket_bound_us(index) / 1e6, self.max)
+        return self.max
+
+    def summary(self):
+        return {
+            "count": self.count,
+            "total_ms": round(self.total * 1e3, 3),
+            "p50_ms": round(self.percentile(50) * 1e3, 3),
+            "p95_ms": round(self.percentile(95) * 1e3, 3),
+            "p99_ms": round(self.percentile(99) * 1e3, 3),
+            "max_ms": round(self.max * 1e3, 3),
+            "buckets_us": {
+                f"{bucket_bound_us(i):.0f}": n for i, n in enumerate(self.counts) if n
+            },
+        }
+
+
+class Instrumentation:
+    """Times every bind()/after() callback while installed.
+
+    install() wraps tkinter.Misc.bind, bind_all, after and after_idle, so
+    handlers bound or scheduled from then on are timed under a name such
+    as "<Key> FreewriteApp.start_timer_on_typing" or
+    "after SessionTimer._fire". Call it before building the UI.
+    """
+
+    def __init__(self, enabled=False, dump_path=None):
+        self.enabled = enabled
+        self.dump_path = dump_path
+        self.histograms = {}
+        self._originals = None
+
+    @classmethod
+    def from_environment(cls, var="FREEWRITE_DIAGNOSTICS"):
+        value = os.environ.get(var, "")
+        if value in ("", "0"):
+            return cls()
+        return cls(True, value if value.endswith(".json") else DEFAULT_DUMP_PATH)
+
+    def histogram(self, name):
+        hist = self.histograms.get(name)
+        if hist is None:
+            hist = self.histograms[name] = LatencyHistogram()
+        return hist
+
+    def wrap(self, name, func):
+        hist = self.histogram(name)
+        clock = time.perf_counter
+
+        def timed(*args):
+            start = clock()
+            try:
+                return func(*args)
+            finally:
+                hist.record(clock() - start)
+        timed.__wrapped__ = func
+        return timed
+
+    def install(self):
+        if not self.enabled or self._originals is not None:
+            return
+        import tkinter
+        misc = tkinter.Misc
+        self._originals = {name: getattr(misc, name) for name in ("bind", "bind_all", "after", "after_idle")}
+        bind, bind_all = self._originals["bind"], self._originals["bind_all"]
+        after, after_idle = self._originals["after"], self._originals["after_idle"]
+        wrap = self.wrap
+
+        def timed_bind(widget, sequence=None, func=None, add=None):
+            if callable(func):
+                func = wrap(f"{sequence} {callback_name(func)}", func)
+            return bind(widget, sequence, func, add)
+
+        def timed_bind_all(widget, sequence=None, func=None, add=None):
+            if callable(func):
+                func = wrap(f"{sequence} {callback_name(func)}", func)
+            return bind_all(widget, sequence, func, add)
+
+        def timed_after(widget, ms, func=None, *args):
+            if func is not None:
+                func = wrap(f"after {callback_name(func)}", func)
+            return after(widget, ms, func, *args)
+
+        def timed_after_idle(widget, func, *args):
+            return after_idle(widget, wrap(f"after {callback_name(func)}", func), *args)
+
+        misc.bind = timed_bind
+        misc.bind_all = timed_bind_all
+        misc.after = timed_after
+        misc.after_idle = timed_after_idle
+
+    def uninstall(self):
+        if self._originals is None:
+            return
+        import tkinter
+        for name, func in self._originals.items():
+            setattr(tkinter.Misc, name, func)
+        self._originals = None
+
+    def reset(self):
+        # Histograms are cleared in place; wrapped callbacks hold references.
+        for hist in self.histograms.values():
+            hist.__init__()
+
+    def report(self):
+        """Per-callback summaries, slowest p99 first."""
+        rows = [(name, hist.summary()) for name, hist in self.histograms.items() if hist.count]
+        rows.sort(key=lambda row: row[1]["p99_ms"], reverse=True)
+        return rows
+
+    def dump(self, path=None):
+        path = path or self.dump_path
+        if not path:
+            return None
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(dict(self.report()), f, indent=2)
+            f.write("\n")
+        return path
+
+
+class StartupTrace:
+    """Times the phases of startup, in the format of python -X importtime.
+
+    Each mark(phase) prints "startup: <phase us> | <since start us> | phase"
+    to stderr. Disabled, mark() is a single attribute check.
+    """
+
+    def __init__(self, enabled=False, started=None, out=None):
+        self.enabled = enabled
+        self.started = started if started is not None else time.perf_counter()
+        self.last = self.started
+        self.out = out or sys.stderr
+        self.marked = set()
+
+    @classmethod
+    def from_environment(cls, started=None, var="FREEWRITE_STARTUP_TRACE"):
+        if started is None:
+            started = IMPORTED_AT
+        return cls(os.environ.get(var, "") not in ("", "0"), started)
+
+    def mark(self, phase):
+        if not self.enabled:
+            return
+        now = time.perf_counter()
+        print(f"startup: {(now - self.last) * 1e6:10.0f} | {(now - self.started) * 1e6:10.0f} | {phase}",
+              file=self.out)
+        self.last = now
+        self.marked.add(phase)
+
+    def mark_once(self, phase):
+        if self.enabled and phase not in self.marked:
+            self.mark(phase)
@@ -0,0 +1,236 @@
+"""Content-addressed storage for draft snapshots."""
+import codecs
+import datetime
+import hashlib
+import io
+import mmap
+import os
+import shutil
+import threading
+import time
+
+from freewrite.persistence import atomic_write
+
+
+class StoredDraft:
+    """A history entry kept in the store; quacks like os.DirEntry."""
+
+    __slots__ = ("name", "store")
+
+    def __init__(self, name, store):
+        self.name = name
+        self.store = store
+
+    def is_file(self):
+        return True
+
+    def stat(self):
+        return self.store.stat(self.name)
+
+
+class DraftStore:
+    """Keeps each distinct draft text once, under its SHA-256.
+
+    Blobs live in drafts/.objects/ab/<hash>.txt and a history entry is a
+    line "<name>\\t<hash>" in drafts/.refs, so the history panel still sees
+    one freewrite_<timestamp>.txt entry per snapshot while disk usage and
+    file count only grow with distinct content. A snapshot identical to the
+    previous one is not recorded at all.
+
+    Plain .txt files already in drafts/ are left alone and take precedence
+    over a ref with the same name. Drafts older than a cut-off can be moved
+    into the per-month DraftArchive; open(), read() and stat() find them
+    there transparently.
+    """
+
+    def __init__(self, drafts_dir="drafts"):
+        self.drafts_dir = drafts_dir
+        self.objects_dir = os.path.join(drafts_dir, ".objects")
+        self.refs_path = os.path.join(drafts_dir, ".refs")
+        self.lock = threading.Lock()
+        self.refs = {}
+        self.last_hash = None
+        self._load_refs()
+        self._archive = None
+        self._archive_lock = threading.Lock()
+
+    def _load_refs(self):
+        try:
+            with open(self.refs_path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    name, sep, digest = line.rstrip("\n").partition("\t")
+                    if sep and len(digest) == 64:
+                        self.refs[name] = digest
+                        self.last_hash = digest
+        except FileNotFoundError:
+            pass
+
+    @property
+    def archive(self):
+        """The DraftArchive, opened (and zipfile imported) on first use."""
+        with self._archive_lock:
+            if self._archive is None:
+                from freewrite.archive import DraftArchive
+                self._archive = DraftArchive(self.drafts_dir)
+            return self._archive
+
+    def blob_path(self, digest):
+        return os.path.join(self.objects_dir, digest[:2], digest + ".txt")
+
+    def put(self, name, text):
+        """Record text as history entry name; blocking, run it on the writer.
+
+        Returns False when the text matches the previous snapshot and
+        nothing was written.
+        """
+        digest = hashlib.sha256(text.encode('utf-8')).hexdigest()
+        with self.lock:
+            if digest == self.last_hash:
+                return False
+        blob = self.blob_path(digest)
+        if not os.path.exists(blob):
+            os.makedirs(os.path.dirname(blob), exist_ok=True)
+            atomic_write(blob, text)
+        with open(self.refs_path, 'a', encoding='utf-8') as f:
+            f.write(f"{name}\t{digest}\n")
+        with self.lock:
+            self.refs[name] = digest
+            self.last_hash = digest
+        return True
+
+    def path_for(self, name):
+        """Filesystem path holding the text of history entry name.
+
+        Returns None for drafts that only exist inside an archive.
+        """
+        plain = os.path.join(self.drafts_dir, name)
+        if os.path.exists(plain):
+            return plain
+        with self.lock:
+            digest = self.refs.get(name)
+        if digest:
+            return self.blob_path(digest)
+        return None if name in self.archive else plain
+
+    def open_binary(self, name):
+        path = self.path_for(name)
+        if path is None:
+            return self.archive.open(name)
+        return open(path, 'rb')
+
+    def open(self, name):
+        """Text file object for history entry name, wherever it is kept."""
+        path = self.path_for(name)
+        if path is None:
+            return io.TextIOWrapper(self.archive.open(name), encoding='utf-8')
+        return open(path, 'r', encoding='utf-8')
+
+    def read(self, name):
+        with self.open(name) as f:
+            return f.read()
+
+    def iter_chunks(self, name, chunk_bytes=1 << 16):
+        """Yield a draft's text piece by piece instead of reading it whole.
+
+        Files on disk are memory-mapped; archived drafts are streamed from
+        their zip member. Undecodable bytes are replaced, not fatal.
+        """
+        decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+        path = self.path_for(name)
+        if path is None:
+            with self.archive.open(name) as f:
+                for block in iter(lambda: f.read(chunk_bytes), b""):
+                    yield decoder.decode(block)
+        else:
+            with open(path, 'rb') as f:
+                if os.fstat(f.fileno()).st_size:
+                    with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                        for start in range(0, len(mm), chunk_bytes):
+                            yield decoder.decode(mm[start:start + chunk_bytes])
+        tail = decoder.decode(b"", final=True)
+        if tail:
+            yield tail
+
+    def stat(self, name):
+        path = self.path_for(name)
+        if path is None:
+            return self.archive.stat(name)
+        return os.stat(path)
+
+    def copy_to(self, name, target_path):
+        """Copy a draft's bytes to target_path in chunks."""
+        with self.open_binary(name) as src, open(target_path, 'wb') as dst:
+            shutil.copyfileobj(src, dst)
+        return target_path
+
+    def entries(self):
+        """StoredDraft entries for every ref and archived draft, unordered."""
+        with self.lock:
+            names = set(self.refs)
+        names.update(self.archive.names())
+        return [StoredDraft(name, self) for name in names]
+
+    def archive_older_than(self, days, now=None):
+        """Move drafts older than days into per-month archives.
+
+        Blocking; run it on the writer thread so it never overlaps put().
+        Only freewrite_<timestamp>.txt drafts are archived, dated by their
+        name; files the user put in drafts/ are left alone. A draft's .keys
+        file, if any, is deleted. Returns the number of drafts archived.
+        """
+        if not os.path.isdir(self.drafts_dir):
+            return 0
+        cutoff = (now if now is not None else time.time()) - days * 86400
+        months = {}
+
+        def consider(name, source):
+            if not (name.startswith("freewrite_") and name.endswith(".txt")):
+                return
+            try:
+                created = datetime.datetime.strptime(name[len("freewrite_"):-len(".txt")],
+                                                     "%Y%m%d-%H%M%S")
+            except ValueError:
+                return
+            if created.timestamp() < cutoff:
+                months.setdefault(created.strftime("%Y-%m"), []).append((name, source))
+
+        with os.scandir(self.drafts_dir) as it:
+            plain = [(entry.name, entry.path) for entry in it
+                     if entry.name.endswith(".txt") and entry.is_file()]
+        for name, source in plain:
+            consider(name, source)
+        with self.lock:
+            refs = list(self.refs.items())
+        plain_names = {name for name, _ in plain}
+        for name, digest in refs:
+            if name not in plain_names:
+                consider(name, self.blob_path(digest))
+
+        archived = []
+        for month, items in sorted(months.items()):
+            archived.extend(self.archive.add(month, items))
+        if not archived:
+            return 0
+
+        # Sources are only removed once their archive has been closed.
+        with self.lock:
+            dropped = {name: self.refs.pop(name) for name in archived if name in self.refs}
+            remaining = dict(self.refs)
+        for name in archived:
+            if name in plain_names:
+                os.remove(os.path.join(self.drafts_dir, name))
+            # Keystroke timings are only kept for drafts still in drafts/.
+            keys = os.path.join(self.drafts_dir, os.path.splitext(name)[0] + ".keys")
+            if os.path.exists(keys):
+                os.remove(keys)
+        if dropped:
+            atomic_write(self.refs_path, "".join(f"{n}\t{d}\n" for n, d in remaining.items()))
+            live = set(remaining.values())
+            for digest in set(dropped.values()) - live:
+                blob = self.blob_path(digest)
+                try:
+                    os.remove(blob)
+                    os.rmdir(os.path.dirname(blob))
+                except OSError:
+                    pass
+        return len(archived)
@@ -0,0 +1,168 @@
+"""Streaming export of drafts to text, Markdown, HTML and JSON Lines."""
+import collections
+import html
+import io
+import json
+import os
+import shutil
+import tempfile
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+
+from freewrite.history_index import parse_draft_date
+from freewrite.wordcount import count_words_stream
+
+FORMATS = {
+    ".txt": "txt",
+    ".md": "md",
+    ".markdown": "md",
+    ".html": "html",
+    ".htm": "html",
+    ".jsonl": "jsonl",
+}
+
+
+def format_for(path, default="txt"):
+    return FORMATS.get(os.path.splitext(path)[1].lower(), default)
+
+
+def _metadata(store, name, words=None):
+    created = parse_draft_date(name)
+    if words is None:
+        words = count_words_stream(store.iter_chunks(name))
+    return {
+        "name": name,
+        "date": created.isoformat() if created else None,
+        "words": words,
+    }
+
+
+def render(store, name, fmt, out, words=None):
+    """Write one draft in fmt to the text stream out, a chunk at a time."""
+    if fmt == "txt":
+        for chunk in store.iter_chunks(name):
+            out.write(chunk)
+        return
+    meta = _metadata(store, name, words)
+    if fmt == "md":
+        out.write("---\n")
+        out.write(f"title: {json.dumps(name)}\n")
+        if meta["date"]:
+            out.write(f"date: {meta['date']}\n")
+        out.write(f"words: {meta['words']}\n")
+        out.write("---\n\n")
+        for chunk in store.iter_chunks(name):
+            out.write(chunk)
+        out.write("\n")
+    elif fmt == "html":
+        title = html.escape(name)
+        out.write("<!DOCTYPE html>\n<html>\n<head>\n<meta charset=\"utf-8\">\n")
+        out.write(f"<title>{title}</title>\n")
+        out.write("<style>body{max-width:40em;margin:3em auto;font-family:Georgia,serif;"
+                  "line-height:1.6}article{white-space:pre-wrap}</style>\n</head>\n<body>\n")
+        out.write(f"<h1>{title}</h1>\n<p>{meta['date'] or ''} &middot; {meta['words']} words</p>\n")
+        out.write("<article>")
+        for chunk in store.iter_chunks(name):
+            out.write(html.escape(chunk, quote=False))
+        out.write("</article>\n</body>\n</html>\n")
+    elif fmt == "jsonl":
+        # json.dumps of each chunk, minus its quotes, is a valid slice of
+        # the encoded string, so the record never has to be built in memory.
+        head = {key: meta[key] for key in ("name", "date", "words")}
+        out.write(json.dumps(head, ensure_ascii=False)[:-1] + ', "text": "')
+        for chunk in store.iter_chunks(name):
+            out.write(json.dumps(chunk, ensure_ascii=False)[1:-1])
+        out.write('"}\n')
+    else:
+        raise ValueError(f"Unknown export format: {fmt}")
+
+
+def export_draft(store, name, target_path, words=None):
+    """Export one draft; the format follows target_path's extension."""
+    fmt = format_for(target_path)
+    source = store.path_for(name)
+    if fmt == "txt" and source is not None:
+        # copyfile uses sendfile/fcopyfile where the OS has it.
+        shutil.copyfile(source, target_path)
+    elif fmt == "txt":
+        store.copy_to(name, target_path)
+    else:
+        with open(target_path, 'w', encoding='utf-8') as out:
+            render(store, name, fmt, out, words)
+    return target_path
+
+
+def _render_to_temp(store, name, fmt, words):
+    spool = tempfile.SpooledTemporaryFile(max_size=1 << 20)
+    try:
+        out = io.TextIOWrapper(spool, encoding='utf-8')
+        render(store, name, fmt, out, words)
+        out.flush()
+        out.detach()
+    except BaseException:
+        spool.close()
+        raise
+    spool.seek(0)
+    return spool
+
+
+def _rendered_in_order(store, names, fmt, words, workers):
+    """Render drafts on a thread pool, yielding (name, file) in input order.
+
+    At most 2 * workers renders are in flight; each spills to disk past 1 MiB.
+    """
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        pending = collections.deque()
+        for name in names:
+            pending.append((name, pool.submit(_render_to_temp, store, name, fmt, words.get(name))))
+            if len(pending) >= workers * 2:
+                done_name, future = pending.popleft()
+                yield done_name, future.result()
+        while pending:
+            done_name, future = pending.popleft()
+            yield done_name, future.result()
+
+
+def export_batch(store, names, target_path, fmt="txt", words=None, workers=4, progress=None):
+    """Export many drafts into one file.
+
+    A .jsonl target gets one record per draft; anything else is written as
+    a zip with one fmt file per draft. words optionally maps name -> word
+    count (e.g. from the history index) to save a counting pass.
+    progress(done, total) is called from the calling thread.
+    """
+    names = list(names)
+    words = words or {}
+    total = len(names)
+    if format_for(target_path, default="zip") == "jsonl":
+        with open(target_path, 'wb') as out:
+            for done, (name, spool) in enumerate(_rendered_in_order(store, names, "jsonl", words, workers), 1):
+                with spool:
+                    shutil.copyfileobj(spool, out)
+                if progress:
+                    progress(done, total)
+        return total
+    extension = {"txt": ".txt", "md": ".md", "html": ".html", "jsonl": ".jsonl"}[fmt]
+    with zipfile.ZipFile(target_path, 'w', compression=zipfile.ZIP_DEFLATED) as zf:
+        for done, (name, spool) in enumerate(_rendered_in_order(store, names, fmt, words, workers), 1):
+            arcname = os.path.splitext(name)[0] + extension
+            with spool, zf.open(arcname, 'w') as member:
+                shutil.copyfileobj(spool, member)
+            if progress:
+                progress(done, total)
+    return total
+
+
+def drafts_between(entries, start=None, end=None):
+    """Names of entries whose filename date falls in [start, end] (dates)."""
+    names = []
+    for entry in entries:
+        created = parse_draft_date(entry.name)
+        if created is None:
+            continue
+        if start and created.date() < start:
+            continue
+        if end and created.date() > end:
+            continue
+        names.append(entry.name)
+    return names
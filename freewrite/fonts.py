@@ -0,0 +1,67 @@
+"""Named Tk fonts shared by the editor, history viewers and panels."""
+from tkinter import font as tkfont
+
+# name -> (family, size, weight, slant); created on first use.
+FONT_SPECS = {
+    "editor": ("Lato", 18, "normal", "roman"),
+    "ui": ("Arial", 12, "normal", "roman"),
+    "ui-small": ("Arial", 10, "normal", "roman"),
+    "ui-bold": ("Arial", 12, "bold", "roman"),
+    "ui-italic": ("Arial", 12, "normal", "italic"),
+    "preview": ("Arial", 11, "normal", "roman"),
+    "label": ("Arial", 14, "normal", "roman"),
+    "heading": ("Arial", 16, "bold", "roman"),
+    "title": ("Arial", 18, "bold", "roman"),
+    "close": ("Arial", 22, "normal", "roman"),
+    "mono": ("Courier", 11, "normal", "roman"),
+}
+
+
+class FontRegistry:
+    """One named Tk font per role, shared by every widget that shows it.
+
+    Widgets are given the font object (its Tk name), not a tuple, so
+    configure("editor", size=20) changes one font and Tk re-lays out the
+    main editor and every open history window together. metrics() are
+    cached per (family, size, weight, slant).
+    """
+
+    def __init__(self, root, specs=None):
+        self.root = root
+        self.specs = dict(FONT_SPECS if specs is None else specs)
+        self.fonts = {}
+        self._metrics = {}
+
+    def __getitem__(self, name):
+        font = self.fonts.get(name)
+        if font is None:
+            family, size, weight, slant = self.specs[name]
+            font = tkfont.Font(root=self.root, name=f"freewrite-{name}", exists=False,
+                               family=family, size=size, weight=weight, slant=slant)
+            self.fonts[name] = font
+        return font
+
+    def family(self, name):
+        return self.specs[name][0]
+
+    def size(self, name):
+        return self.specs[name][1]
+
+    def configure(self, name, family=None, size=None):
+        """Change a named font in place; returns its (family, size)."""
+        old_family, old_size, weight, slant = self.specs[name]
+        family = family or old_family
+        size = size or old_size
+        if (family, size) != (old_family, old_size):
+            self.specs[name] = (family, size, weight, slant)
+            if name in self.fonts:
+                self.fonts[name].configure(family=family, size=size)
+        return family, size
+
+    def metrics(self, name):
+        """Font.metrics() (ascent, descent, linespace, fixed) of a named font, cached."""
+        key = self.specs[name]
+        cached = self._metrics.get(key)
+        if cached is None:
+            cached = self._metrics[key] = self[name].metrics()
+        return cached
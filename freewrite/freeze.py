@@ -0,0 +1,167 @@
+"""Long-session mode: hide old text from Tk's layout while keeping it in the widget."""
+import tkinter as tk
+
+from freewrite.theme import themed
+from freewrite.wordcount import count_words
+
+
+class ParagraphFreezer:
+    """Elides everything but the last stretch of a long session.
+
+    With backspace disabled nothing above the cursor can change, so once
+    the live text passes freeze_after_chars the older part is tagged
+    elide=1 and Tk skips it when laying out the view. The text itself
+    stays in the widget, so get() and the word count see all of it.
+
+    A placeholder line at the top stands in for the frozen part. Scrolling
+    up to it thaws thaw_chars at a time; clicking it thaws everything.
+    """
+
+    freeze_after_chars = 60_000
+    keep_chars = 20_000
+    thaw_chars = 20_000
+
+    def __init__(self, text, placeholder_options=None, linespace=None):
+        self.text = text
+        self.placeholder_options = placeholder_options or {}
+        # Line height of the placeholder's font, if the caller has it measured.
+        self.linespace = linespace
+        self.enabled = True
+        self.placeholder = None
+        self.label = None
+        self.frozen_words = 0
+        self._thaw_pending = False
+        self.text.tag_configure("frozen", elide=True)
+        self.text.configure(yscrollcommand=self._on_yview)
+        self.text.bind("<Configure>", self._fit_placeholder, add="+")
+
+    @property
+    def frozen(self):
+        if self.placeholder is not None and not self.placeholder.winfo_exists():
+            # Deleted along with the text around it (select all, type).
+            self._forget()
+        return self.placeholder is not None
+
+    def maybe_freeze(self):
+        """Freeze older text if the live part has grown too long; cheap otherwise."""
+        if not self.enabled:
+            return
+        text = self.text
+        start = "frozen_end" if self.frozen else "1.0"
+        # count() walks Tk's per-line character totals, not the text itself.
+        live = text.count(start, "end-1c", "chars")
+        if not live or live[0] < self.freeze_after_chars:
+            return
+        # Only while the user is writing at the end, never under someone reading.
+        if text.bbox(tk.INSERT) is None or text.compare(tk.INSERT, "<", f"end-1c-{self.keep_chars}c"):
+            return
+        boundary = text.index(f"end-1c-{self.keep_chars}c wordstart")
+        if not self.frozen:
+            self._create_placeholder()
+            start = "frozen_start"
+        if text.compare(boundary, "<=", start):
+            return
+        self.frozen_words += count_words(text.get(start, boundary))
+        text.tag_add("frozen", start, boundary)
+        text.mark_set("frozen_end", boundary)
+        self._update_placeholder()
+
+    def thaw(self, chars=None):
+        """Reveal the last `chars` of the frozen part (all of it by default)."""
+        if not self.frozen:
+            return
+        text = self.text
+        # Keep what was on screen where it was; from the placeholder itself
+        # that is the first live character, so one scroll thaws one chunk.
+        top = text.index("@0,0")
+        if text.compare(top, "<", "frozen_end"):
+            top = text.index("frozen_end")
+        if chars is None:
+            boundary = "frozen_start"
+        else:
+            boundary = text.index(f"frozen_end-{chars}c wordstart")
+            if text.compare(boundary, "<", "frozen_start"):
+                boundary = "frozen_start"
+        self.frozen_words -= count_words(text.get(boundary, "frozen_end"))
+        text.tag_remove("frozen", boundary, "frozen_end")
+        text.mark_set("frozen_end", boundary)
+        if text.compare("frozen_end", "<=", "frozen_start"):
+            self._remove_placeholder()
+        else:
+            self._update_placeholder()
+        text.yview(top)
+
+    def reset(self):
+        """Forget frozen state, e.g. after the editor was cleared or replaced."""
+        self.text.tag_remove("frozen", "1.0", tk.END)
+        self._remove_placeholder()
+
+    def set_enabled(self, enabled):
+        self.enabled = enabled
+        if not enabled:
+            self.thaw()
+
+    def _create_placeholder(self):
+        text = self.text
+        # A frame a full line wide, so live text never flows in beside it.
+        self.placeholder = tk.Frame(text)
+        # Themed background only: the muted foreground is part of the look.
+        self.label = themed(tk.Label(self.placeholder, cursor="hand2", anchor="w",
+                                     **self.placeholder_options), background="bg")
+        self.label.pack(fill="both", expand=True)
+        self.label.bind("<Button-1>", lambda e: self.thaw())
+        self.placeholder.pack_propagate(False)
+        if self.linespace is None:
+            self.placeholder.configure(height=self.label.winfo_reqheight())
+        else:
+            # Plus the label's border and padding.
+            self.placeholder.configure(height=self.linespace + 4)
+        self._fit_placeholder()
+        text.window_create("1.0", window=self.placeholder, pady=10)
+        text.mark_set("frozen_start", "1.1")
+        text.mark_gravity("frozen_start", tk.LEFT)
+        text.mark_set("frozen_end", "1.1")
+        self.frozen_words = 0
+
+    def _fit_placeholder(self, event=None):
+        if self.placeholder is not None:
+            padx = int(self.text.cget("padx"))
+            self.placeholder.configure(width=max(1, self.text.winfo_width() - 2 * padx - 4))
+
+    def _update_placeholder(self):
+        if not self.frozen:
+            return
+        self.label.configure(
+            text=f"⋯ {self.frozen_words} earlier words hidden — scroll up or click to show"
+        )
+
+    def _remove_placeholder(self):
+        if self.placeholder is None:
+            return
+        placeholder = self.placeholder
+        try:
+            self.text.delete(placeholder)
+        except tk.TclError:
+            pass  # already gone with the text around it
+        placeholder.destroy()
+        self._forget()
+
+    def _forget(self):
+        """Drop the placeholder and frozen ranges; remaining text shows again."""
+        self.placeholder = None
+        self.label = None
+        self.text.tag_remove("frozen", "1.0", tk.END)
+        for mark in ("frozen_start", "frozen_end"):
+            self.text.mark_unset(mark)
+        self.frozen_words = 0
+
+    def _on_yview(self, first, last):
+        if (self.frozen and not self._thaw_pending and float(first) <= 0.0
+                and self.text.bbox(self.placeholder) is not None):
+            # Deferred: thawing changes the view this callback reports on.
+            self._thaw_pending = True
+            self.text.after_idle(self._thaw_chunk)
+
+    def _thaw_chunk(self):
+        self._thaw_pending = False
+        self.thaw(self.thaw_chars)
@@ -0,0 +1,419 @@
+"""On-disk metadata and full-text index for the drafts directory."""
+import datetime
+import math
+import os
+import re
+import sqlite3
+import threading
+
+from freewrite.wordcount import count_words
+
+PREVIEW_CHARS = 100
+PAGE_SIZE = 50
+# Queries matching more drafts than this are listed newest first; ranking
+# thousands of near-equal hits with bm25 costs more than it tells.
+RANK_LIMIT = 500
+# Bump when the tables change; the index is a cache and is simply rebuilt.
+SCHEMA_VERSION = 2
+
+# Letters and digits, like FTS5's unicode61 tokenizer (so "_" splits).
+_TOKEN_RE = re.compile(r"[^\W_]+")
+
+
+_DRAFT_NAME_RE = re.compile(r"freewrite_(\d{8}-\d{6})")
+
+
+def tokenize(text):
+    return _TOKEN_RE.findall(text.lower())
+
+
+def _draft_sort_key(entry):
+    match = _DRAFT_NAME_RE.match(entry.name)
+    return (1, match.group(1), entry.name) if match else (0, "", entry.name)
+
+
+def iter_drafts(drafts_dir, store=None):
+    """Yield DirEntry objects for the drafts in drafts_dir, newest first.
+
+    Only the names are sorted up front (by the timestamp in
+    freewrite_YYYYmmdd-HHMMSS.txt); nothing is stat'ed or read until the
+    caller gets to an entry. Entries from a DraftStore are merged in.
+    """
+    with os.scandir(drafts_dir) as it:
+        entries = [entry for entry in it if entry.name.endswith(".txt")]
+    if store is not None:
+        plain = {entry.name for entry in entries}
+        entries.extend(entry for entry in store.entries() if entry.name not in plain)
+    entries.sort(key=_draft_sort_key, reverse=True)
+    for entry in entries:
+        if entry.is_file():
+            yield entry
+
+
+def parse_draft_date(name):
+    """Return the datetime encoded in freewrite_YYYYmmdd-HHMMSS.txt, or None."""
+    try:
+        date_str = name.replace("freewrite_", "").replace(".txt", "")
+        return datetime.datetime.strptime(date_str, "%Y%m%d-%H%M%S")
+    except ValueError:
+        return None
+
+
+def make_preview(content):
+    return content[:PREVIEW_CHARS] + ("..." if len(content) > PREVIEW_CHARS else "")
+
+
+class DraftInfo:
+    __slots__ = ("name", "size", "mtime_ns", "words", "preview", "created")
+
+    def __init__(self, name, size, mtime_ns, words, preview, created):
+        self.name = name
+        self.size = size
+        self.mtime_ns = mtime_ns
+        self.words = words
+        self.preview = preview
+        self.created = created
+
+    @property
+    def formatted_date(self):
+        if self.created is None:
+            return self.name
+        return datetime.datetime.fromtimestamp(self.created).strftime("%B %d, %Y at %I:%M %p")
+
+
+class HistoryIndex:
+    """SQLite table of per-draft metadata, keyed by file name.
+
+    refresh() only stats the directory and re-reads files whose size or
+    mtime changed, so opening the history panel no longer costs a full read
+    of every draft.
+
+    Draft text is also indexed for search(): in an FTS5 table when this
+    SQLite build has it, otherwise in a plain term/posting table that is
+    queried and ranked in Python. Rows are linked to the drafts table by
+    rowid, so re-indexing one draft never scans the others.
+    """
+
+    def __init__(self, drafts_dir="drafts", path=None, store=None):
+        self.drafts_dir = drafts_dir
+        self.store = store
+        os.makedirs(drafts_dir, exist_ok=True)
+        self.path = path or os.path.join(drafts_dir, ".index.sqlite3")
+        self.lock = threading.RLock()
+        self.db = sqlite3.connect(self.path, check_same_thread=False)
+        if self.db.execute("PRAGMA user_version").fetchone()[0] != SCHEMA_VERSION:
+            for table in ("drafts", "drafts_fts", "terms"):
+                self.db.execute(f"DROP TABLE IF EXISTS {table}")
+            self.db.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+        self.db.execute(
+            "CREATE TABLE IF NOT EXISTS drafts ("
+            "name TEXT PRIMARY KEY, size INTEGER, mtime_ns INTEGER, "
+            "words INTEGER, preview TEXT, created REAL)"
+        )
+        try:
+            self.db.execute(
+                "CREATE VIRTUAL TABLE IF NOT EXISTS drafts_fts "
+                "USING fts5(name, content, prefix='2 3')"
+            )
+            self.has_fts5 = True
+        except sqlite3.OperationalError:
+            self.has_fts5 = False
+            self.db.execute(
+                "CREATE TABLE IF NOT EXISTS terms ("
+                "term TEXT, doc INTEGER, tf INTEGER, PRIMARY KEY (term, doc)) WITHOUT ROWID"
+            )
+            self.db.execute("CREATE INDEX IF NOT EXISTS terms_doc ON terms(doc)")
+        self.db.commit()
+
+    def close(self):
+        with self.lock:
+            self.db.close()
+
+    def _stat(self, name):
+        if self.store is not None:
+            return self.store.stat(name)
+        return os.stat(os.path.join(self.drafts_dir, name))
+
+    def _read(self, name):
+        try:
+            if self.store is not None:
+                return self.store.read(name)
+            with open(os.path.join(self.drafts_dir, name), 'r', encoding='utf-8') as f:
+                return f.read()
+        except (OSError, UnicodeDecodeError):
+            return None
+
+    def _store(self, name, size, mtime_ns, content):
+        created = parse_draft_date(name)
+        if content is None:
+            words, preview = 0, "Error reading file"
+        else:
+            words, preview = count_words(content), make_preview(content)
+        # An upsert keeps the rowid stable for the text index.
+        self.db.execute(
+            "INSERT INTO drafts VALUES (?, ?, ?, ?, ?, ?) ON CONFLICT(name) DO UPDATE SET "
+            "size=excluded.size, mtime_ns=excluded.mtime_ns, words=excluded.words, "
+            "preview=excluded.preview, created=excluded.created",
+            (name, size, mtime_ns, words, preview,
+             created.timestamp() if created else None)
+        )
+        rowid = self.db.execute("SELECT rowid FROM drafts WHERE name = ?", (name,)).fetchone()[0]
+        self._unindex_text(rowid)
+        self._index_text(rowid, name, content or "")
+
+    def _delete(self, names):
+        for name in names:
+            row = self.db.execute("SELECT rowid FROM drafts WHERE name = ?", (name,)).fetchone()
+            if row:
+                self._unindex_text(row[0])
+                self.db.execute("DELETE FROM drafts WHERE rowid = ?", row)
+
+    def _index_text(self, rowid, name, content):
+        if self.has_fts5:
+            self.db.execute(
+                "INSERT INTO drafts_fts(rowid, name, content) VALUES (?, ?, ?)",
+                (rowid, name, content)
+            )
+            return
+        counts = {}
+        for term in tokenize(name) + tokenize(content):
+            counts[term] = counts.get(term, 0) + 1
+        self.db.executemany(
+            "INSERT INTO terms VALUES (?, ?, ?)",
+            [(term, rowid, tf) for term, tf in counts.items()]
+        )
+
+    def _unindex_text(self, rowid):
+        if self.has_fts5:
+            self.db.execute("DELETE FROM drafts_fts WHERE rowid = ?", (rowid,))
+        else:
+            self.db.execute("DELETE FROM terms WHERE doc = ?", (rowid,))
+
+    def refresh(self, on_first_page=None, should_stop=None):
+        """Bring the index in line with the directory; returns changed names.
+
+        Drafts are visited newest first. If the first PAGE_SIZE of them
+        needed re-indexing, that much is committed and on_first_page() is
+        called before the (possibly long) rest of the scan, so the first page
+        of the panel can be shown early.
+
+        should_stop() is checked between drafts; if it returns true, what
+        was re-indexed so far is committed and None is returned.
+        """
+        with self.lock:
+            known = {
+                name: (size, mtime_ns)
+                for name, size, mtime_ns in self.db.execute("SELECT name, size, mtime_ns FROM drafts")
+            }
+        changed = []
+        for position, entry in enumerate(iter_drafts(self.drafts_dir, self.store), 1):
+            if should_stop is not None and should_stop():
+                with self.lock:
+                    self.db.commit()
+                return None
+            st = entry.stat()
+            signature = (st.st_size, st.st_mtime_ns)
+            if known.pop(entry.name, None) != signature:
+                with self.lock:
+                    self._store(entry.name, st.st_size, st.st_mtime_ns, self._read(entry.name))
+                changed.append(entry.name)
+            if position == PAGE_SIZE and changed:
+                with self.lock:
+                    self.db.commit()
+                if on_first_page:
+                    on_first_page()
+        with self.lock:
+            if known:
+                self._delete(known)
+                changed.extend(known)
+            self.db.commit()
+        return changed
+
+    def update_file(self, name, content=None):
+        """Re-index one draft, e.g. right after it was written."""
+        with self.lock:
+            try:
+                st = self._stat(name)
+            except FileNotFoundError:
+                self._delete([name])
+            else:
+                if content is None:
+                    content = self._read(name)
+                self._store(name, st.st_size, st.st_mtime_ns, content)
+            self.db.commit()
+
+    def entry(self, name):
+        """Metadata for one draft, or None if it is not indexed."""
+        with self.lock:
+            row = self.db.execute("SELECT * FROM drafts WHERE name = ?", (name,)).fetchone()
+        return DraftInfo(*row) if row else None
+
+    def entries(self, limit=PAGE_SIZE, offset=0):
+        """Draft metadata, newest first."""
+        with self.lock:
+            rows = self.db.execute(
+                "SELECT * FROM drafts ORDER BY name DESC LIMIT ? OFFSET ?", (limit, offset)
+            ).fetchall()
+        return [DraftInfo(*row) for row in rows]
+
+    def search(self, query, limit=PAGE_SIZE, offset=0):
+        """Drafts matching every word of query (as prefixes), best first.
+
+        With more than RANK_LIMIT matches they come newest first instead.
+        """
+        terms = tokenize(query)
+        with self.lock:
+            if not terms:
+                rows = self.db.execute(
+                    "SELECT * FROM drafts WHERE instr(lower(name), ?) ORDER BY name DESC LIMIT ? OFFSET ?",
+                    (query.lower(), limit, offset)
+                ).fetchall()
+            elif self.has_fts5:
+                # One-letter prefixes would expand to most of the vocabulary
+                # (the prefix index starts at two), so they match whole words.
+                match = " ".join(('"%s"' if len(term) == 1 else '"%s"*') % term for term in terms)
+                hits = self.db.execute(
+                    "SELECT count(*) FROM (SELECT 1 FROM drafts_fts WHERE drafts_fts MATCH ? LIMIT ?)",
+                    (match, RANK_LIMIT + 1)
+                ).fetchone()[0]
+                if hits > RANK_LIMIT:
+                    rows = self.db.execute(
+                        "SELECT * FROM drafts WHERE rowid IN "
+                        "(SELECT rowid FROM drafts_fts WHERE drafts_fts MATCH ?) "
+                        "ORDER BY name DESC LIMIT ? OFFSET ?",
+                        (match, limit, offset)
+                    ).fetchall()
+                else:
+                    rows = self.db.execute(
+                        "SELECT d.* FROM drafts_fts JOIN drafts d ON d.rowid = drafts_fts.rowid "
+                        "WHERE drafts_fts MATCH ? ORDER BY bm25(drafts_fts) LIMIT ? OFFSET ?",
+                        (match, limit, offset)
+                    ).fetchall()
+            else:
+                rows = self._search_terms(terms, limit, offset)
+        return [DraftInfo(*row) for row in rows]
+
+    def _search_terms(self, terms, limit, offset):
+        total = self.db.execute("SELECT count(*) FROM drafts").fetchone()[0] or 1
+        scores = None
+        for term in terms:
+            postings = self.db.execute(
+                "SELECT doc, tf FROM terms WHERE term >= ? AND term < ?",
+                (term, term + "\U0010ffff")
+            ).fetchall()
+            if not postings:
+                return []
+            idf = math.log(1 + total / len(postings))
+            term_scores = {}
+            for doc, tf in postings:
+                term_scores[doc] = term_scores.get(doc, 0.0) + tf * idf
+            if scores is None:
+                scores = term_scores
+            else:
+                scores = {doc: score + term_scores[doc] for doc, score in scores.items() if doc in term_scores}
+        best = sorted(scores, key=scores.get, reverse=True)[offset:offset + limit]
+        rows = []
+        for doc in best:
+            row = self.db.execute("SELECT * FROM drafts WHERE rowid = ?", (doc,)).fetchone()
+            if row:
+                rows.append(row)
+        return rows
+
+
+class HistorySearch:
+    """Runs history queries on a worker thread; only the newest one counts.
+
+    Each submit() bumps a generation number. A query that has not started
+    yet is simply replaced, and results from an older generation are
+    dropped instead of being handed to the UI. An index refresh stops as
+    soon as a newer request arrives; that request answers first and then
+    finishes the refresh. Like PersistenceWorker, the callback runs on the
+    Tk thread via a short schedule() poll while a query is in flight.
+    """
+
+    poll_ms = 30
+
+    def __init__(self, index, schedule):
+        self.index = index
+        self.schedule = schedule
+        self.generation = 0
+        self._request = None
+        self._result = None
+        self._running = False
+        self._polling = False
+        self._stale = False
+        self._cond = threading.Condition()
+        self._thread = threading.Thread(target=self._run, name="freewrite-search", daemon=True)
+        self._thread.start()
+
+    def submit(self, query, callback, refresh=False, offset=0):
+        """Fetch one page of entries (or matches for query) starting at offset.
+
+        With refresh=True the index is also brought up to date; the page is
+        delivered from the existing index first and again if it changed.
+        """
+        with self._cond:
+            self.generation += 1
+            self._request = (self.generation, query, callback, refresh, offset)
+            self._cond.notify()
+        if not self._polling:
+            self._polling = True
+            self.schedule(self.poll_ms, self._poll)
+
+    def cancel(self):
+        with self._cond:
+            self.generation += 1
+            self._request = None
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while self._request is None:
+                    self._cond.wait()
+                generation, query, callback, refresh, offset = self._request
+                self._request = None
+                self._running = True
+
+            def deliver():
+                if query:
+                    entries = self.index.search(query, offset=offset)
+                else:
+                    entries = self.index.entries(PAGE_SIZE, offset)
+                with self._cond:
+                    if generation == self.generation:
+                        self._result = (generation, callback, entries)
+
+            def superseded():
+                return generation != self.generation
+
+            try:
+                if not (refresh or self._stale):
+                    deliver()
+                elif offset:
+                    # A later page is appended to the list, so it is
+                    # delivered exactly once, after the refresh.
+                    self._stale = self.index.refresh(should_stop=superseded) is None
+                    deliver()
+                else:
+                    # A newer query (or cancel) stops the scan between
+                    # drafts; the next request picks it up again.
+                    deliver()
+                    changed = self.index.refresh(on_first_page=deliver, should_stop=superseded)
+                    self._stale = changed is None
+                    if changed:
+                        deliver()
+            except Exception as e:
+                print(f"History search failed: {e}")
+            with self._cond:
+                self._running = False
+
+    def _poll(self):
+        with self._cond:
+            result, self._result = self._result, None
+            busy = self._running or self._request is not None
+        if result is not None and result[0] == self.generation:
+            result[1](result[2])
+        if busy:
+            self.schedule(self.poll_ms, self._poll)
+        else:
+            self._polling = False
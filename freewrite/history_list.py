@@ -0,0 +1,258 @@
+"""Virtualized list of history entries for the slide-out history panel."""
+import tkinter as tk
+from tkinter import font as tkfont
+
+from freewrite.theme import themed
+
+DEFAULT_FONTS = {
+    "date": ("Arial", 12, "bold"),
+    "words": ("Arial", 10),
+    "preview": ("Arial", 11),
+    "empty": ("Arial", 12, "italic"),
+}
+PREVIEW_WRAP = 280
+# Vertical space a row adds around its labels: body pady, the word
+# count's pady, and each label's border and padding.
+ROW_PADDING = 2 * 12 + (2 + 5) + 3 * 4
+
+
+class HistoryRow:
+    """One recycled row: a frame with date, word count and preview labels."""
+
+    def __init__(self, history_list):
+        colors = history_list.colors
+        fonts = history_list.fonts
+        self.record = None
+        self.history_list = history_list
+        self.frame = tk.Frame(history_list.canvas, bg=colors["bg"], borderwidth=0)
+        self.body = tk.Frame(self.frame, bg=colors["bg"], padx=20, pady=12, borderwidth=0)
+        self.body.pack(fill=tk.BOTH, expand=True)
+        self.date_label = tk.Label(
+            self.body,
+            font=fonts["date"],
+            bg=colors["bg"],
+            fg=colors["fg"],
+            anchor="w"
+        )
+        self.date_label.pack(fill=tk.X, anchor="w")
+        self.word_label = tk.Label(
+            self.body,
+            font=fonts["words"],
+            bg=colors["bg"],
+            fg=colors["accent"],
+            anchor="w"
+        )
+        themed(self.word_label, background="bg", foreground="accent")
+        self.word_label.pack(fill=tk.X, anchor="w", pady=(2, 5))
+        self.preview_label = tk.Label(
+            self.body,
+            font=fonts["preview"],
+            bg=colors["bg"],
+            fg=colors["fg"],
+            anchor="nw",
+            justify=tk.LEFT,
+            wraplength=PREVIEW_WRAP
+        )
+        self.preview_label.pack(fill=tk.X, anchor="w")
+        self.divider = themed(tk.Frame(self.frame, height=1, bg=colors["accent"]), background="accent")
+        self.divider.place(x=20, rely=1.0, y=-1, relwidth=1.0, width=-40)
+
+        # Bound once; the handlers look at whichever record the row shows now.
+        for widget in (self.body, self.date_label, self.word_label, self.preview_label):
+            widget.bind("<Button-1>", lambda e: self.record and history_list.on_open(self.record.name))
+        self.body.bind("<Enter>", lambda e: self.set_bg(history_list.colors["hover"]))
+        self.body.bind("<Leave>", lambda e: self.set_bg(history_list.colors["bg"]))
+
+        self.window = history_list.canvas.create_window(
+            0, 0, window=self.frame, anchor="nw",
+            width=history_list.canvas.winfo_width(), height=history_list.row_height,
+            state="hidden"
+        )
+
+    def set_bg(self, color):
+        self.body.configure(bg=color)
+
+    def show(self, record, last):
+        if record is not self.record:
+            self.record = record
+            self.date_label.configure(text=record.formatted_date)
+            self.word_label.configure(text=f"{record.words} words")
+            self.preview_label.configure(text=self.history_list.fit_preview(record.preview))
+        if last:
+            self.divider.place_forget()
+        else:
+            self.divider.place(x=20, rely=1.0, y=-1, relwidth=1.0, width=-40)
+
+
+class HistoryList:
+    """Canvas list that only builds enough rows to fill the viewport.
+
+    Entries are kept as a plain list of DraftInfo records (__slots__
+    objects). On scroll the same few row widgets are moved and refilled.
+
+    Records arrive a page at a time; when the view gets near the end of
+    what is loaded, on_more(offset) is asked for the next page.
+
+    Rows are sized from the fonts' line spacing (`metrics` maps a role to
+    Font.metrics(), measured here if missing) to hold preview_lines lines
+    of preview; longer previews are cut to fit.
+    """
+
+    overscan = 2
+    preview_lines = 3
+
+    def __init__(self, parent, colors, on_open, on_more=None, fonts=None, metrics=None):
+        self.colors = colors
+        self.fonts = dict(DEFAULT_FONTS, **(fonts or {}))
+        preview_font = self.fonts["preview"]
+        if not isinstance(preview_font, tkfont.Font):
+            preview_font = tkfont.Font(root=parent, font=preview_font)
+        self.measure = preview_font.measure
+        metrics = dict(metrics or {})
+        for role in ("date", "words", "preview"):
+            if role not in metrics:
+                metrics[role] = tkfont.Font(root=parent, font=self.fonts[role]).metrics()
+        self.row_height = (ROW_PADDING + metrics["date"]["linespace"] + metrics["words"]["linespace"]
+                           + self.preview_lines * metrics["preview"]["linespace"])
+        self.on_open = on_open
+        self.on_more = on_more
+        self.records = []
+        self.has_more = False
+        self.loading = False
+        self.rows = []
+        self.canvas = tk.Canvas(parent, bg=colors["bg"], highlightthickness=0, borderwidth=0,
+                                yscrollincrement=self.row_height // 4)
+        self.canvas.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        self.scrollbar = tk.Scrollbar(parent, orient="vertical", command=self.canvas.yview)
+        self.scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.canvas.configure(yscrollcommand=self._on_scroll)
+        self.empty_text = self.canvas.create_text(
+            0, 20, text="No entries found", font=self.fonts["empty"],
+            fill=colors["fg"], anchor="n", state="hidden"
+        )
+        self.canvas.bind("<Configure>", self._on_configure)
+
+    def fit_preview(self, text):
+        """text wrapped like the preview label, cut to preview_lines lines."""
+        measure = self.measure
+        lines, line = [], ""
+        for word in text.split():
+            candidate = f"{line} {word}" if line else word
+            if not line or measure(candidate) <= PREVIEW_WRAP:
+                line = candidate
+                continue
+            lines.append(line)
+            line = word
+            if len(lines) == self.preview_lines:
+                last = lines[-1]
+                while " " in last and measure(last + "...") > PREVIEW_WRAP:
+                    last = last.rsplit(" ", 1)[0]
+                lines[-1] = last + "..."
+                return "\n".join(lines)
+        if line:
+            lines.append(line)
+        return "\n".join(lines)
+
+    def set_colors(self, colors):
+        """Take new theme colors; the widgets themselves are recolored by the theme."""
+        self.colors.update(colors)
+        self.canvas.itemconfigure(self.empty_text, fill=colors["fg"])
+
+    def set_records(self, records, has_more=False):
+        self.records = records
+        self.has_more = has_more
+        self.loading = False
+        for row in self.rows:
+            row.record = None
+        width = self.canvas.winfo_width()
+        self.canvas.configure(scrollregion=(0, 0, width, len(records) * self.row_height))
+        self.canvas.coords(self.empty_text, width // 2, 20)
+        self.canvas.itemconfigure(self.empty_text, state="hidden" if records else "normal")
+        self.canvas.yview_moveto(0)
+        self.layout()
+
+    def add_records(self, records, has_more=False):
+        """Append the next page of records."""
+        self.records.extend(records)
+        self.has_more = has_more
+        self.loading = False
+        self._resize()
+        self.layout()
+
+    def _position(self, name, ordered):
+        """(index, found) for name; ordered lists (newest first) are bisected."""
+        records = self.records
+        if not ordered:
+            for index, record in enumerate(records):
+                if record.name == name:
+                    return index, True
+            return None, False
+        lo, hi = 0, len(records)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if records[mid].name > name:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo, lo < len(records) and records[lo].name == name
+
+    def upsert(self, record, ordered=True):
+        """Show a new or changed record without reloading the list.
+
+        Search results are not ordered by name (ordered=False); there a
+        record is only replaced if it is already listed.
+        """
+        index, found = self._position(record.name, ordered)
+        if found:
+            self.records[index] = record
+        elif index is None or (index == len(self.records) and self.has_more):
+            return  # belongs to a page that has not been loaded
+        else:
+            self.records.insert(index, record)
+            self._resize()
+        self.layout()
+
+    def remove(self, name, ordered=True):
+        index, found = self._position(name, ordered)
+        if found:
+            del self.records[index]
+            self._resize()
+            self.layout()
+
+    def _resize(self):
+        width = self.canvas.winfo_width()
+        self.canvas.configure(scrollregion=(0, 0, width, len(self.records) * self.row_height))
+        self.canvas.itemconfigure(self.empty_text, state="hidden" if self.records else "normal")
+
+    def _on_scroll(self, first, last):
+        self.scrollbar.set(first, last)
+        self.layout()
+
+    def _on_configure(self, event):
+        self.canvas.configure(scrollregion=(0, 0, event.width, len(self.records) * self.row_height))
+        self.canvas.coords(self.empty_text, event.width // 2, 20)
+        for row in self.rows:
+            self.canvas.itemconfigure(row.window, width=event.width)
+        self.layout()
+
+    def layout(self):
+        """Point the pooled rows at the records currently in view."""
+        height = max(self.canvas.winfo_height(), self.row_height)
+        needed = min(len(self.records), height // self.row_height + 1 + 2 * self.overscan)
+        while len(self.rows) < needed:
+            self.rows.append(HistoryRow(self))
+        top = int(self.canvas.canvasy(0)) // self.row_height
+        first = max(0, top - self.overscan)
+        for i, row in enumerate(self.rows):
+            index = first + i
+            if index < len(self.records):
+                row.show(self.records[index], index == len(self.records) - 1)
+                self.canvas.coords(row.window, 0, index * self.row_height)
+                self.canvas.itemconfigure(row.window, state="normal")
+            else:
+                row.record = None
+                self.canvas.itemconfigure(row.window, state="hidden")
+        if (self.has_more and not self.loading and self.on_more
+                and first + len(self.rows) >= len(self.records) - self.overscan):
+            self.loading = True
+            self.on_more(len(self.records))
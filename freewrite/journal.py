@@ -0,0 +1,196 @@
+"""Append-only autosave journal for a single writing session."""
+import datetime
+import json
+import os
+
+from freewrite.persistence import atomic_write
+
+
+def common_prefix_length(a, b):
+    """Length of the shared prefix of two strings, using C-level compares."""
+    if b.startswith(a):
+        return len(a)
+    lo, hi = 0, min(len(a), len(b))
+    while lo < hi:
+        mid = (lo + hi + 1) // 2
+        if a[:mid] == b[:mid]:
+            lo = mid
+        else:
+            hi = mid - 1
+    return lo
+
+
+def snapshot_name():
+    timestamp = datetime.datetime.now().strftime("%Y%m%d-%H%M%S")
+    return f"freewrite_{timestamp}.txt"
+
+
+def _compact(journal_path, snapshot, text, store=None):
+    """Returns False when no new snapshot was written (e.g. a duplicate)."""
+    stored = False
+    if snapshot:
+        if store is None:
+            atomic_write(snapshot, text)
+            stored = True
+        else:
+            stored = store.put(os.path.basename(snapshot), text)
+    os.remove(journal_path)
+    return stored
+
+
+def replay(path):
+    """Rebuild the text recorded in a journal file.
+
+    Each line is {"k": chars kept from the previous text, "t": new tail}.
+    A torn final line from a crash is ignored; a bad line anywhere else
+    raises ValueError rather than silently dropping what follows it.
+    """
+    text = ""
+    bad_line = None
+    with open(path, 'rb') as f:
+        for number, line in enumerate(f, 1):
+            if bad_line is not None:
+                raise ValueError(f"{path}: corrupt journal record on line {bad_line}")
+            try:
+                record = json.loads(line)
+                text = text[:record["k"]] + record["t"]
+            except (ValueError, KeyError, TypeError):
+                bad_line = number
+    return text
+
+
+class SessionJournal:
+    """Records autosaves as small edit records instead of full copies.
+
+    Backspace is disabled by default, so almost every record is a plain
+    append of what was typed since the previous autosave. Writes go through
+    the given PersistenceWorker when there is one, and snapshots go into
+    the DraftStore when there is one.
+    """
+
+    def __init__(self, drafts_dir="drafts", writer=None, store=None):
+        self.drafts_dir = drafts_dir
+        self.writer = writer
+        self.store = store
+        self.journal_dir = os.path.join(drafts_dir, ".journal")
+        self.path = None
+        self.saved = ""
+        self.size = 0
+        # Set on the writer thread: the last snapshot finish() actually wrote.
+        self.last_stored = None
+
+    def make_record(self, text):
+        """Return the journal line for text, or None if nothing changed."""
+        keep = common_prefix_length(self.saved, text)
+        if keep == len(self.saved) == len(text):
+            return None
+        return json.dumps({"k": keep, "t": text[keep:]}, ensure_ascii=False) + "\n"
+
+    def append(self, text):
+        record = self.make_record(text)
+        if record is None:
+            return False
+        if self.path is None:
+            self.path = os.path.join(self.journal_dir, snapshot_name()[:-4] + ".jsonl")
+            self.size = 0
+            self._run(lambda: os.makedirs(self.journal_dir, exist_ok=True))
+        if self.writer is None:
+            with open(self.path, 'a', encoding='utf-8') as f:
+                f.write(record)
+        else:
+            self.writer.append(self.path, record, on_error=self._append_failed)
+        self.saved = text
+        self.size += len(record.encode('utf-8'))
+        return True
+
+    def _run(self, func):
+        if self.writer is None:
+            func()
+        else:
+            self.writer.call(func)
+
+    def _append_failed(self, error):
+        # The journal may now be missing a record; make the next one a full
+        # rewrite (k=0) so replay still ends up with the right text.
+        print(f"Journal write failed: {error}")
+        self.saved = ""
+
+    def finish(self, text):
+        """Compact the journal into one draft snapshot and start afresh.
+
+        Returns the snapshot path, or None if there was no journal.
+        """
+        if self.path is None:
+            return None
+        snapshot = None
+        if text.strip():
+            snapshot = os.path.join(self.drafts_dir, snapshot_name())
+        path = self.path
+        # Queued behind any pending appends; the journal is only removed
+        # once the snapshot has been written.
+
+        def compact():
+            stored = _compact(path, snapshot, text, self.store)
+            self.last_stored = snapshot if stored else None
+
+        self._run(compact)
+        self.path = None
+        self.saved = ""
+        return snapshot
+
+    def resume(self, path):
+        """Carry on appending to an existing journal; returns its text.
+
+        A torn last record is cut off first, so new records start on a line
+        of their own.
+        """
+        with open(path, 'r+b') as f:
+            data = f.read()
+            end = data.rfind(b"\n") + 1
+            if end < len(data):
+                f.truncate(end)
+        text = replay(path)
+        self.path = path
+        self.saved = text
+        self.size = os.path.getsize(path)
+        return text
+
+    def recover(self):
+        """Replay journals left behind by a crash into draft snapshots.
+
+        A journal's keystroke timings (<ts>.keys beside <ts>.jsonl) move
+        next to its snapshot; timings with no snapshot are deleted.
+        Returns the recovered texts, oldest first.
+        """
+        if not os.path.isdir(self.journal_dir):
+            return []
+        recovered = []
+        names = sorted(os.listdir(self.journal_dir))
+        unreplayed = set()
+        for name in names:
+            if not name.endswith(".jsonl"):
+                continue
+            path = os.path.join(self.journal_dir, name)
+            try:
+                text = replay(path)
+            except Exception as e:
+                print(f"Could not replay journal {name}: {e}")
+                unreplayed.add(name[:-6] + ".keys")
+                continue
+            keys = os.path.join(self.journal_dir, name[:-6] + ".keys")
+            if text.strip():
+                # Keep the journal's own timestamp so history stays in order.
+                snapshot = os.path.join(self.drafts_dir, name[:-6] + ".txt")
+                if _compact(path, snapshot, text, self.store) and os.path.exists(keys):
+                    os.replace(keys, os.path.splitext(snapshot)[0] + ".keys")
+                recovered.append(text)
+            else:
+                os.remove(path)
+        # Whatever is left belongs to no journal (or to a duplicate draft).
+        for name in names:
+            if name.endswith(".keys") and name not in unreplayed:
+                try:
+                    os.remove(os.path.join(self.journal_dir, name))
+                except FileNotFoundError:
+                    pass
+        return recovered
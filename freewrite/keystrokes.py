@@ -0,0 +1,202 @@
+"""Keystroke timing for a session, kept in a fixed-size ring buffer."""
+import os
+import struct
+import sys
+import time
+from array import array
+
+MAX_DELTA_MS = 0xFFFFFFFF
+CHARS_PER_WORD = 5
+
+
+def _append_block(path, data):
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, 'ab') as f:
+        f.write(data)
+
+
+def _move(source, target):
+    if os.path.exists(source):
+        os.replace(source, target)
+
+
+def _merge(source, target):
+    """Move source to target, appending to target if it already has blocks."""
+    if not os.path.exists(source):
+        return
+    if not os.path.exists(target):
+        os.replace(source, target)
+        return
+    with open(source, 'rb') as f, open(target, 'ab') as out:
+        out.write(f.read())
+    os.remove(source)
+
+
+def read_keystrokes(path):
+    """All deltas (ms) stored in a .keys file, as one array('I')."""
+    deltas = array('I')
+    with open(path, 'rb') as f:
+        while True:
+            header = f.read(4)
+            if len(header) < 4:
+                break
+            (count,) = struct.unpack("<I", header)
+            block = array('I')
+            try:
+                block.frombytes(f.read(4 * count))
+            except ValueError:
+                break  # torn final block
+            if sys.byteorder == "big":
+                block.byteswap()
+            deltas.extend(block)
+    return deltas
+
+
+class KeystrokeRecorder:
+    """Records the gap before every keystroke, in milliseconds.
+
+    Gaps go into a preallocated array('I') ring of `capacity` slots; once
+    half of it is unflushed, that half is handed to the writer as one
+    binary block (a little-endian uint32 count followed by the deltas).
+    Totals, pauses and a rolling WPM over the last `window_ms` are updated
+    per keystroke.
+    """
+
+    def __init__(self, journal_dir, writer=None, capacity=4096, pause_ms=2000,
+                 window_ms=60_000, clock=time.monotonic_ns):
+        self.journal_dir = journal_dir
+        self.writer = writer
+        self.capacity = capacity
+        self.pause_ms = pause_ms
+        self.window_ms = window_ms
+        self.clock = clock
+        self.buffer = array('I', bytes(4 * capacity))
+        self.path = None
+        self.reset()
+
+    def reset(self):
+        self.head = 0
+        self.unflushed = 0
+        self.last_ns = None
+        self.keys = 0
+        self.active_ms = 0
+        self.pauses = 0
+        self.pause_total_ms = 0
+        self.longest_pause_ms = 0
+        self.window_keys = 0
+        self.window_sum_ms = 0
+
+    def record(self):
+        """Note one keystroke now."""
+        now = self.clock()
+        delta = 0 if self.last_ns is None else min(MAX_DELTA_MS, (now - self.last_ns) // 1_000_000)
+        self.last_ns = now
+        buffer = self.buffer
+        buffer[self.head] = delta
+        self.head = (self.head + 1) % self.capacity
+        self.keys += 1
+
+        if delta >= self.pause_ms:
+            self.pauses += 1
+            self.pause_total_ms += delta
+            if delta > self.longest_pause_ms:
+                self.longest_pause_ms = delta
+        else:
+            self.active_ms += delta
+
+        # Rolling window: drop the oldest gaps until it spans window_ms.
+        self.window_keys += 1
+        self.window_sum_ms += delta
+        while self.window_keys > 1 and (self.window_sum_ms > self.window_ms
+                                        or self.window_keys >= self.capacity):
+            oldest = buffer[(self.head - self.window_keys) % self.capacity]
+            self.window_sum_ms -= oldest
+            self.window_keys -= 1
+
+        self.unflushed += 1
+        if self.unflushed >= self.capacity // 2:
+            self.flush()
+
+    def wpm(self):
+        """Words per minute over the rolling window (5 characters a word)."""
+        if self.window_sum_ms <= 0:
+            return 0.0
+        return (self.window_keys / CHARS_PER_WORD) / (self.window_sum_ms / 60_000)
+
+    def average_wpm(self):
+        """Words per minute over the whole session, not counting pauses."""
+        if self.active_ms <= 0:
+            return 0.0
+        return (self.keys / CHARS_PER_WORD) / (self.active_ms / 60_000)
+
+    def stats(self):
+        return {
+            "keys": self.keys,
+            "wpm": round(self.wpm(), 1),
+            "average_wpm": round(self.average_wpm(), 1),
+            "pauses": self.pauses,
+            "pause_total_ms": self.pause_total_ms,
+            "longest_pause_ms": self.longest_pause_ms,
+        }
+
+    def _run(self, func):
+        if self.writer is None:
+            func()
+        else:
+            self.writer.call(func)
+
+    def flush(self):
+        """Hand the unflushed deltas to the writer as one block."""
+        if not self.unflushed:
+            return
+        start = (self.head - self.unflushed) % self.capacity
+        if start < self.head:
+            block = self.buffer[start:self.head]
+        else:
+            block = self.buffer[start:] + self.buffer[:self.head]
+        if sys.byteorder == "big":
+            block.byteswap()
+        data = struct.pack("<I", len(block)) + block.tobytes()
+        self.unflushed = 0
+        if self.path is None:
+            name = time.strftime("%Y%m%d-%H%M%S") + ".keys"
+            self.path = os.path.join(self.journal_dir, name)
+        path = self.path
+        self._run(lambda: _append_block(path, data))
+
+    def attach(self, journal_path):
+        """Name the timings after the session's journal: <ts>.jsonl, <ts>.keys.
+
+        Journal recovery finds them by that name. A journal resumed after a
+        restart brings its earlier timings back the same way.
+        """
+        target = os.path.splitext(journal_path)[0] + ".keys"
+        if self.path == target:
+            return
+        source, self.path = self.path, target
+        if source is not None:
+            self._run(lambda: _merge(source, target))
+
+    def finish(self, snapshot=None, stored=None):
+        """Flush and move the timings next to the snapshot the session became.
+
+        freewrite_<ts>.txt gets freewrite_<ts>.keys beside it. stored(), if
+        given, is asked on the writer thread whether the snapshot was really
+        written; without one (or a snapshot) the recording is discarded.
+        The counters start afresh.
+        """
+        self.flush()
+        path, self.path = self.path, None
+        self.reset()
+        if path is None:
+            return None
+        target = None if snapshot is None else os.path.splitext(snapshot)[0] + ".keys"
+
+        def keep_or_discard():
+            if target is not None and (stored is None or stored()):
+                _move(path, target)
+            elif os.path.exists(path):
+                os.remove(path)
+
+        self._run(keep_or_discard)
+        return target
@@ -0,0 +1,248 @@
+"""Background writer thread so disk I/O never runs on the Tk thread."""
+import os
+import queue
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+
+
+def atomic_write(path, text, fsync=False):
+    """Write text to path through a temp file and an atomic rename."""
+    directory = os.path.dirname(path) or "."
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".tmp-", suffix=".part")
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            f.write(text)
+            if fsync:
+                f.flush()
+                os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+def fsync_directory(directory):
+    """Make a rename durable; a no-op where directories can't be opened."""
+    try:
+        fd = os.open(directory or ".", os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+class _Job:
+    __slots__ = ("kind", "data", "callbacks")
+
+    def __init__(self, kind, data, on_done, on_error):
+        self.kind = kind
+        self.data = data
+        self.callbacks = [(on_done, on_error)]
+
+
+class PersistenceWorker:
+    """Single writer thread fed by a coalescing queue.
+
+    Jobs are keyed by target path and run in the order they were first
+    queued. A new snapshot for a path replaces any snapshot still waiting
+    for it, in its place (only the latest text matters), and consecutive
+    appends to the same path are merged into one write.
+
+    With a schedule function (root.after), completion callbacks are run on
+    the Tk thread by a short poll that only runs while work is in flight;
+    the worker thread itself never touches Tk. Without one, callbacks run on
+    the worker thread.
+
+    With fsync=True every write is flushed to disk; batch_delay then lets a
+    burst of jobs collect so the directory fsyncs happen once per batch.
+    """
+
+    poll_ms = 50
+
+    def __init__(self, schedule=None, fsync=False, batch_delay=0.0):
+        self.schedule = schedule
+        self.fsync = fsync
+        self.batch_delay = batch_delay
+        self._pending = OrderedDict()
+        self._cond = threading.Condition()
+        self._busy = False
+        self._closed = False
+        self._results = queue.SimpleQueue()
+        self._polling = False
+        self._calls = 0
+        self._thread = threading.Thread(target=self._run, name="freewrite-writer", daemon=True)
+        self._thread.start()
+
+    # Submitting work (any thread, normally the Tk thread)
+
+    def write(self, path, text, on_done=None, on_error=None):
+        """Atomically replace path with text."""
+        self._submit(path, _Job("write", text, on_done, on_error))
+
+    def append(self, path, text, on_done=None, on_error=None):
+        """Append text to path."""
+        self._submit(path, _Job("append", [text], on_done, on_error))
+
+    def remove(self, path, on_done=None, on_error=None):
+        self._submit(path, _Job("remove", None, on_done, on_error))
+
+    def call(self, func, on_done=None, on_error=None):
+        """Run func() on the writer thread; on_done receives its result."""
+        with self._cond:
+            self._calls += 1
+            key = ("call", self._calls)
+        self._submit(key, _Job("call", func, on_done, on_error))
+
+    def _submit(self, key, job):
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("persistence worker is closed")
+            pending = self._pending.get(key)
+            if pending is not None and job.kind == "append":
+                # Fold the new tail into the job that is already waiting;
+                # appending to a file about to be removed writes just the tail.
+                if pending.kind == "append":
+                    pending.data.extend(job.data)
+                elif pending.kind == "write":
+                    pending.data += job.data[0]
+                else:
+                    pending.kind, pending.data = "write", job.data[0]
+                pending.callbacks.extend(job.callbacks)
+            else:
+                if pending is not None:
+                    # Superseded: the new job reports for both and keeps the
+                    # old one's place, so it never overtakes calls queued later.
+                    job.callbacks[:0] = pending.callbacks
+                self._pending[key] = job
+            self._cond.notify_all()
+        self._start_polling()
+
+    # Waiting
+
+    def idle(self):
+        with self._cond:
+            return not self._pending and not self._busy
+
+    def flush(self, timeout=None):
+        """Block until every submitted job has been written."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            while self._pending or self._busy:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._cond.wait(remaining)
+        self._drain()
+        return True
+
+    def close(self, timeout=None):
+        """Finish outstanding work and stop the thread."""
+        self.flush(timeout)
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        self._thread.join(timeout)
+
+    # Worker side
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._pending and not self._closed:
+                    self._cond.wait()
+                if not self._pending:
+                    return
+            if self.fsync and self.batch_delay:
+                time.sleep(self.batch_delay)
+            with self._cond:
+                batch = list(self._pending.items())
+                self._pending.clear()
+                self._busy = True
+            try:
+                self._run_batch(batch)
+            finally:
+                with self._cond:
+                    self._busy = False
+                    self._cond.notify_all()
+
+    def _run_batch(self, batch):
+        directories = set()
+        for key, job in batch:
+            try:
+                result = self._execute(key, job)
+                if job.kind in ("write", "remove"):
+                    directories.add(os.path.dirname(key))
+                outcome = (True, result)
+            except Exception as e:
+                outcome = (False, e)
+            for on_done, on_error in job.callbacks:
+                self._report(on_done if outcome[0] else on_error, outcome[1])
+        if self.fsync:
+            for directory in directories:
+                fsync_directory(directory)
+
+    def _execute(self, key, job):
+        if job.kind == "write":
+            atomic_write(key, job.data, fsync=self.fsync)
+            return key
+        if job.kind == "append":
+            with open(key, 'a', encoding='utf-8') as f:
+                f.write("".join(job.data))
+                if self.fsync:
+                    f.flush()
+                    os.fsync(f.fileno())
+            return key
+        if job.kind == "remove":
+            try:
+                os.remove(key)
+            except FileNotFoundError:
+                pass
+            return key
+        return job.data()
+
+    def _report(self, callback, value):
+        if callback is None:
+            return
+        if self.schedule is None:
+            try:
+                callback(value)
+            except Exception as e:
+                print(f"Persistence callback failed: {e}")
+        else:
+            self._results.put((callback, value))
+
+    # Tk-thread side
+
+    def _start_polling(self):
+        if self.schedule is not None and not self._polling:
+            self._polling = True
+            self.schedule(self.poll_ms, self._poll)
+
+    def _poll(self):
+        self._drain()
+        if self.idle() and self._results.empty():
+            self._polling = False
+        else:
+            self.schedule(self.poll_ms, self._poll)
+
+    def _drain(self):
+        if self.schedule is None:
+            return
+        while True:
+            try:
+                callback, value = self._results.get_nowait()
+            except queue.Empty:
+                return
+            try:
+                callback(value)
+            except Exception as e:
+                print(f"Persistence callback failed: {e}")
@@ -0,0 +1,39 @@
+"""Pointer to the session in progress, for restoring it after a crash.
+
+drafts/.session.json names the live journal and carries the timer, font
+and theme. It is rewritten (atomically, by the writer) after each
+autosave and removed when the session ends cleanly.
+"""
+import json
+import os
+
+STATE_FILE = ".session.json"
+VERSION = 1
+
+
+def state_path(drafts_dir="drafts"):
+    return os.path.join(drafts_dir, STATE_FILE)
+
+
+def load_state(drafts_dir="drafts"):
+    """The saved state dict, or None if there is no usable one."""
+    try:
+        with open(state_path(drafts_dir), 'r', encoding='utf-8') as f:
+            state = json.load(f)
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError) as e:
+        print(f"Could not read session state: {e}")
+        return None
+    if not isinstance(state, dict) or state.get("version") != VERSION:
+        return None
+    return state
+
+
+def save_state(writer, state, drafts_dir="drafts"):
+    """Queue an atomic rewrite of the state file on the writer."""
+    writer.write(state_path(drafts_dir), json.dumps(dict(state, version=VERSION)))
+
+
+def clear_state(writer, drafts_dir="drafts"):
+    writer.remove(state_path(drafts_dir))
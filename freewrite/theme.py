@@ -0,0 +1,101 @@
+"""Color themes: precomputed palettes, option database defaults and recolor."""
+
+# Which palette role each option of a widget class takes, unless the widget
+# carries its own theme_roles (see themed()). Classes not listed, such as
+# Menu and Scrollbar, keep their native look.
+CLASS_ROLES = {
+    "Tk": {"background": "bg"},
+    "Toplevel": {"background": "bg"},
+    "Frame": {"background": "bg"},
+    "Canvas": {"background": "bg"},
+    "Label": {"background": "bg", "foreground": "fg"},
+    "Button": {"background": "bg", "foreground": "fg",
+               "activebackground": "hover", "activeforeground": "fg"},
+    "Entry": {"background": "bg", "foreground": "fg", "insertbackground": "accent"},
+    "Text": {"background": "bg", "foreground": "fg", "insertbackground": "accent"},
+}
+
+
+def lighten(hex_color, factor=0.1):
+    """Blend a #rrggbb color towards white; named colors come back unchanged."""
+    value = hex_color.lstrip('#')
+    if len(value) != 6:
+        return hex_color
+    try:
+        r, g, b = int(value[0:2], 16), int(value[2:4], 16), int(value[4:6], 16)
+    except ValueError:
+        return hex_color
+    r = min(255, int(r + (255 - r) * factor))
+    g = min(255, int(g + (255 - g) * factor))
+    b = min(255, int(b + (255 - b) * factor))
+    return f'#{r:02x}{g:02x}{b:02x}'
+
+
+def make_palette(theme):
+    """Every color a theme needs, worked out once."""
+    return {
+        "name": theme["name"],
+        "bg": theme["bg"],
+        "fg": theme["fg"],
+        "accent": theme["cursor"],
+        "hover": lighten(theme["bg"]),
+    }
+
+
+def themed(widget, **roles):
+    """Give widget its own option -> role map; no roles leaves it alone."""
+    widget.theme_roles = roles
+    return widget
+
+
+class ThemeEngine:
+    """Applies one of a list of palettes to the whole application.
+
+    apply() first pushes the palette into the Tk option database, so any
+    widget created afterwards starts out in the right colors, then walks
+    the live widget tree (the `children` dicts tkinter already keeps) and
+    recolors everything in a single Tcl script.
+    """
+
+    def __init__(self, root, themes, index=0):
+        self.root = root
+        self.palettes = [make_palette(theme) for theme in themes]
+        self.index = index
+        self.listeners = []
+
+    @property
+    def palette(self):
+        return self.palettes[self.index]
+
+    def add_listener(self, callback):
+        """callback(palette) runs after every apply(), e.g. to refresh cached colors."""
+        self.listeners.append(callback)
+
+    def push_options(self):
+        palette = self.palette
+        for class_name, roles in CLASS_ROLES.items():
+            for option, role in roles.items():
+                self.root.option_add(f"*{class_name}.{option}", palette[role])
+
+    def recolor(self):
+        palette = self.palette
+        script = []
+        stack = [self.root]
+        while stack:
+            widget = stack.pop()
+            stack.extend(widget.children.values())
+            roles = getattr(widget, "theme_roles", None)
+            if roles is None:
+                roles = CLASS_ROLES.get(type(widget).__name__)
+            if roles:
+                options = " ".join(f"-{option} {{{palette[role]}}}" for option, role in roles.items())
+                script.append(f"catch {{{widget._w} configure {options}}}")
+        self.root.tk.eval("\n".join(script))
+
+    def apply(self, index=None):
+        if index is not None:
+            self.index = index % len(self.palettes)
+        self.push_options()
+        self.recolor()
+        for callback in self.listeners:
+            callback(self.palette)
@@ -0,0 +1,284 @@
+"""Change notifications for the drafts directory: inotify, or mtime polling."""
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import sys
+import threading
+import time
+
+REFS_NAME = ".refs"
+
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_Q_OVERFLOW = 0x00004000
+IN_NONBLOCK = os.O_NONBLOCK
+IN_CLOEXEC = 0o2000000
+WATCH_MASK = IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE | IN_DELETE_SELF
+
+_EVENT = struct.Struct("iIII")  # wd, mask, cookie, len; then the name
+
+
+def merge_kind(previous, kind):
+    """What a name's pending event becomes after another one; None cancels it."""
+    if previous == "add":
+        return None if kind == "remove" else "add"
+    if previous == "remove" and kind != "remove":
+        return "modify"
+    return kind
+
+
+def is_draft(name):
+    return name.endswith(".txt") and not name.startswith(".")
+
+
+class InotifyBackend:
+    """Reads inotify events for one directory on a thread; Linux only.
+
+    Raises OSError from the constructor where inotify is not available,
+    so the caller can fall back to PollingBackend.
+    """
+
+    name = "inotify"
+
+    def __init__(self, directory, record):
+        if not sys.platform.startswith("linux"):
+            raise OSError("inotify needs Linux")
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or None, use_errno=True)
+        try:
+            init, add_watch = libc.inotify_init1, libc.inotify_add_watch
+        except AttributeError:
+            raise OSError("libc has no inotify") from None
+        add_watch.argtypes = (ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32)
+        self.fd = init(IN_NONBLOCK | IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        if add_watch(self.fd, os.fsencode(directory), WATCH_MASK) < 0:
+            errno = ctypes.get_errno()
+            os.close(self.fd)
+            raise OSError(errno, f"cannot watch {directory}")
+        self.record = record
+        self._wake_r, self._wake_w = os.pipe()
+        self._thread = threading.Thread(target=self._run, name="freewrite-watcher", daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        os.write(self._wake_w, b"x")
+        self._thread.join(timeout=1.0)
+        for fd in (self.fd, self._wake_r, self._wake_w):
+            os.close(fd)
+
+    def _run(self):
+        while True:
+            ready, _, _ = select.select([self.fd, self._wake_r], [], [])
+            if self._wake_r in ready:
+                return
+            try:
+                data = os.read(self.fd, 64 * 1024)
+            except BlockingIOError:
+                continue
+            offset = 0
+            while offset + _EVENT.size <= len(data):
+                _, mask, _, length = _EVENT.unpack_from(data, offset)
+                offset += _EVENT.size
+                name = os.fsdecode(data[offset:offset + length].rstrip(b"\0"))
+                offset += length
+                if mask & (IN_Q_OVERFLOW | IN_DELETE_SELF):
+                    self.record("rescan", None)
+                elif mask & (IN_CREATE | IN_MOVED_TO):
+                    self.record("add", name)
+                elif mask & (IN_DELETE | IN_MOVED_FROM):
+                    self.record("remove", name)
+                elif mask & IN_CLOSE_WRITE:
+                    self.record("modify", name)
+
+
+class PollingBackend:
+    """Compares (size, mtime_ns) of each entry every `interval` seconds.
+
+    Stat'ing the directory still grows with the number of drafts, but it
+    happens off the Tk thread, and only names that changed go further.
+    """
+
+    name = "poll"
+
+    def __init__(self, directory, record, interval=1.0):
+        self.directory = directory
+        self.record = record
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="freewrite-watcher", daemon=True)
+
+    def scan(self):
+        signatures = {}
+        try:
+            with os.scandir(self.directory) as it:
+                for entry in it:
+                    if is_draft(entry.name) or entry.name == REFS_NAME:
+                        try:
+                            st = entry.stat()
+                        except FileNotFoundError:
+                            continue
+                        signatures[entry.name] = (st.st_size, st.st_mtime_ns)
+        except FileNotFoundError:
+            pass
+        return signatures
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join(timeout=1.0)
+
+    def _run(self):
+        known = self.scan()
+        while not self._stop.wait(self.interval):
+            current = self.scan()
+            for name, signature in current.items():
+                previous = known.pop(name, None)
+                if previous is None:
+                    self.record("add", name)
+                elif previous != signature:
+                    self.record("modify", name)
+            for name in known:
+                self.record("remove", name)
+            known = current
+
+
+class DraftsWatcher:
+    """Reports changes in the drafts directory to a callback on the Tk thread.
+
+    The backend thread records (kind, name) pairs, kind being "add",
+    "modify" or "remove". Events for the same name are merged as they
+    arrive (add then modify is an add, add then remove is nothing), and a
+    schedule() poll hands over the batch once the directory has been quiet
+    for coalesce_ms, or max_delay_ms after its first event, whichever
+    comes first. So a burst of writes becomes one callback with one entry
+    per draft.
+
+    DraftStore entries live as lines appended to drafts/.refs; when it
+    grows, the new lines are read from where the last read stopped and
+    reported as adds. A ("rescan", None) event means events were lost and
+    the caller should reload everything.
+    """
+
+    coalesce_ms = 250
+    max_delay_ms = 1000
+
+    def __init__(self, drafts_dir, schedule, callback, clock=time.monotonic, backend=None):
+        self.drafts_dir = drafts_dir
+        self.schedule = schedule
+        self.callback = callback
+        self.clock = clock
+        self.pending = {}
+        self.first_at = None
+        self.last_at = None
+        self.running = False
+        self._lock = threading.Lock()
+        self._refs_offset = self._refs_size()
+        self.backend = backend
+        if self.backend is None:
+            try:
+                self.backend = InotifyBackend(drafts_dir, self.record)
+            except OSError:
+                self.backend = PollingBackend(drafts_dir, self.record)
+
+    def _refs_size(self):
+        try:
+            return os.path.getsize(os.path.join(self.drafts_dir, REFS_NAME))
+        except OSError:
+            return 0
+
+    def start(self):
+        if self.running:
+            return
+        self.running = True
+        self.backend.start()
+        self.schedule(self.coalesce_ms, self._poll)
+
+    def stop(self):
+        if not self.running:
+            return
+        self.running = False
+        self.backend.stop()
+
+    def record(self, kind, name):
+        """Called from the backend thread."""
+        if name == REFS_NAME:
+            if kind == "modify" or (kind == "add" and not self._refs_offset):
+                for ref in self._read_new_refs():
+                    self.record("add", ref)
+            else:
+                # Replaced or removed: the archive sweep rewrites it, and
+                # the drafts it drops are still listed, from the archive.
+                self._refs_offset = self._refs_size()
+            return
+        if name is not None and not is_draft(name):
+            return
+        now = self.clock()
+        with self._lock:
+            if kind == "rescan":
+                self.pending = {None: "rescan"}
+            elif None not in self.pending:
+                merged = merge_kind(self.pending.get(name), kind)
+                if merged is None:
+                    self.pending.pop(name, None)
+                else:
+                    self.pending[name] = merged
+            if self.first_at is None:
+                self.first_at = now
+            self.last_at = now
+
+    def _read_new_refs(self):
+        path = os.path.join(self.drafts_dir, REFS_NAME)
+        try:
+            with open(path, 'rb') as f:
+                size = os.fstat(f.fileno()).st_size
+                if size < self._refs_offset:
+                    self._refs_offset = size
+                    return []
+                f.seek(self._refs_offset)
+                data = f.read(size - self._refs_offset)
+        except OSError:
+            return []
+        # Only complete lines; a half-written one is read next time.
+        end = data.rfind(b"\n") + 1
+        self._refs_offset += end
+        names = []
+        for line in data[:end].decode('utf-8', errors='replace').splitlines():
+            name, sep, _ = line.partition("\t")
+            if sep:
+                names.append(name)
+        return names
+
+    def _take(self):
+        now = self.clock()
+        with self._lock:
+            if not self.pending:
+                return None
+            quiet = (now - self.last_at) * 1000 >= self.coalesce_ms
+            overdue = (now - self.first_at) * 1000 >= self.max_delay_ms
+            if not (quiet or overdue):
+                return None
+            pending, self.pending = self.pending, {}
+            self.first_at = self.last_at = None
+        return [(kind, name) for name, kind in pending.items()]
+
+    def _poll(self):
+        if not self.running:
+            return
+        events = self._take()
+        if events:
+            try:
+                self.callback(events)
+            except Exception as e:
+                print(f"Drafts watcher callback failed: {e}")
+        self.schedule(self.coalesce_ms, self._poll)
@@ -0,0 +1,149 @@
+"""Incremental word counting that matches len(text.split())."""
+
+
+def _starts(prev, text):
+    """Count word starts in text, given the character that precedes it."""
+    count = 0
+    after_space = not prev or prev.isspace()
+    for ch in text:
+        is_space = ch.isspace()
+        if after_space and not is_space:
+            count += 1
+        after_space = is_space
+    return count
+
+
+def count_words(text):
+    return len(text.split())
+
+
+class StreamWordCounter:
+    """Counts words in text that arrives in pieces, via feed()."""
+
+    def __init__(self):
+        self.count = 0
+        self._last = ""
+
+    def feed(self, chunk):
+        if not chunk:
+            return
+        self.count += len(chunk.split())
+        # A word cut in two by the chunk boundary was counted twice.
+        if self._last and not self._last.isspace() and not chunk[0].isspace():
+            self.count -= 1
+        self._last = chunk[-1]
+
+
+def count_words_stream(chunks):
+    """len("".join(chunks).split()) without ever joining the chunks."""
+    counter = StreamWordCounter()
+    for chunk in chunks:
+        counter.feed(chunk)
+    return counter.count
+
+
+class WordCounter:
+    """Keeps a running word count from edit deltas.
+
+    Every edit is described by the text inserted or removed plus the single
+    characters on either side of it.
+    """
+
+    def __init__(self, text=""):
+        self.count = count_words(text)
+
+    def reset(self, text=""):
+        self.count = count_words(text)
+
+    def _delta(self, prev, text, next_char):
+        if not text:
+            return 0
+        # Words that start inside the edited run, plus whether the character
+        # after it starts a word with and without the run in between.
+        joined_start = bool(next_char) and not next_char.isspace() and (not prev or prev.isspace())
+        split_start = bool(next_char) and not next_char.isspace() and text[-1].isspace()
+        return _starts(prev, text) + split_start - joined_start
+
+    def insert(self, prev, text, next_char):
+        """Record text inserted between prev and next_char."""
+        self.count += self._delta(prev, text, next_char)
+        return self.count
+
+    def delete(self, prev, text, next_char):
+        """Record text removed from between prev and next_char."""
+        self.count -= self._delta(prev, text, next_char)
+        return self.count
+
+
+class TextWidgetCounter(WordCounter):
+    """WordCounter that follows every insert/delete on a Tk Text widget.
+
+    The widget's Tcl command is renamed and replaced by a proxy (the same
+    trick idlelib's WidgetRedirector uses), so edits made by key bindings,
+    paste and programmatic calls are all seen.
+    """
+
+    def __init__(self, widget):
+        super().__init__(widget.get("1.0", "end-1c"))
+        self.widget = widget
+        self.listeners = []
+        self._tk = widget.tk
+        self._name = str(widget)
+        self._orig = self._name + "_wordcount_orig"
+        self._tk.call("rename", self._name, self._orig)
+        self._tk.createcommand(self._name, self._dispatch)
+
+    def add_listener(self, callback):
+        """Call callback(op, index, text) after every insert/delete."""
+        self.listeners.append(callback)
+
+    def resync(self):
+        self.reset(self.widget.get("1.0", "end-1c"))
+
+    def _call(self, *args):
+        return self._tk.call(self._orig, *args)
+
+    def _clamp(self, index):
+        index = str(self._call("index", index))
+        if self._call("compare", index, ">", "end-1c"):
+            return str(self._call("index", "end-1c"))
+        return index
+
+    def _notify(self, op, index, text):
+        for callback in self.listeners:
+            callback(op, index, text)
+
+    def _dispatch(self, *args):
+        op = args[0] if args else ""
+        if op == "insert" and len(args) >= 3:
+            index = self._clamp(args[1])
+            text = "".join(args[2::2])
+            prev = self._call("get", index + " -1c", index)
+            next_char = self._call("get", index)
+            result = self._call(*args)
+            self.insert(prev, text, next_char)
+            self._notify("insert", index, text)
+            return result
+        if op == "delete" and len(args) in (2, 3):
+            start = self._clamp(args[1])
+            end = self._clamp(args[2]) if len(args) == 3 else self._clamp(start + " +1c")
+            if not self._call("compare", start, "<", end):
+                return self._call(*args)
+            text = self._call("get", start, end)
+            prev = self._call("get", start + " -1c", start)
+            next_char = self._call("get", end)
+            result = self._call(*args)
+            self.delete(prev, text, next_char)
+            self._notify("delete", start, text)
+            return result
+        if op in ("delete", "replace"):
+            # Multi-range deletes and replace are rare; recount from scratch.
+            result = self._call(*args)
+            self.resync()
+            self._notify("reset", "1.0", "")
+            return result
+        return self._call(*args)
+
+    def detach(self):
+        self._tk.deletecommand(self._name)
+        self._tk.call("rename", self._orig, self._name)
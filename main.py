@@ -1,17 +1,35 @@
+# First, so the startup trace counts from before the other imports.
+from freewrite.diagnostics import Instrumentation, StartupTrace
 import tkinter as tk
-from tkinter import font, filedialog, messagebox
-import time
+from tkinter import messagebox
 import os
+import itertools
+import json
 import threading
 import datetime
-import webbrowser  
-from tkinter import Menu 
-from urllib.parse import quote 
+# Modules only needed by dialogs, export, backup and the history panel
+# (webbrowser, filedialog, zipfile, sqlite3, multiprocessing, ...) are
+# imported where they are used, so they stay off the cold-start path.
+from freewrite.core import Autosaver, DraftStore, Session, SessionTimer
+from freewrite.fonts import FontRegistry
+from freewrite.freeze import ParagraphFreezer
+from freewrite.journal import SessionJournal
+from freewrite.keystrokes import KeystrokeRecorder
+from freewrite.persistence import PersistenceWorker, atomic_write
+from freewrite.session_state import clear_state, load_state, save_state
+from freewrite.theme import ThemeEngine, themed
+from freewrite.wordcount import TextWidgetCounter, count_words_stream
 
 
 class FreewriteApp:
     def __init__(self, root):
         self.root = root
+        # Opt-in via FREEWRITE_STARTUP_TRACE.
+        self.startup = StartupTrace.from_environment()
+        self.startup.mark("imports")
+        # Opt-in via FREEWRITE_DIAGNOSTICS; must be installed before any bind/after.
+        self.instrumentation = Instrumentation.from_environment()
+        self.instrumentation.install()
         self.root.title("Freewrite")
         self.default_width = 1024
         self.default_height = 576
@@ -23,15 +41,9 @@ class FreewriteApp:
         self.font_sizes = [16, 18, 20, 22, 24, 26]  
         self.current_font_size_index = 1  
         self.current_font_size = 18
-        self.session_length_minutes = 15
         self.backspace_disabled = True
         self.dark_mode = False
-        self.start_time = None
-        self.word_count = 0
         self.goal_word_count = 500
-        self.running = False
-        self.paused = False
-        self.timer_started = False
         self.themes = [
             {"name": "White", "bg": "white", "fg": "black", "cursor": "black"},  # Original White Theme
             {"name": "Dark", "bg": "#282c34", "fg": "#abb2bf", "cursor": "#61afef"},  # Original Dark Theme
@@ -51,22 +63,78 @@ class FreewriteApp:
         self.root.grid_rowconfigure(0, weight=1)
         self.root.grid_columnconfigure(0, weight=1)
         
+        self.fonts = FontRegistry(self.root)
         self.create_menu()
+        self.startup.mark("menu")
         self.create_ui_elements()
         self.bind_shortcuts()
-        self.autosave_interval = 60
-        self.schedule_autosave()
-        self.timer_label.config(text=f"{self.session_length_minutes}:00")
+        self.startup.mark("editor")
+        self.theme = ThemeEngine(self.root, self.themes, self.current_theme_index)
+        self.theme.add_listener(self.on_theme_applied)
+        # Windows opened from here on are created in the theme's colors.
+        self.theme.push_options()
+        self.autosave_idle_ms = 2000
+        self.autosave_max_latency_ms = 30000
+        self.search_debounce_ms = 150
+        self.large_file_bytes = 256 * 1024
+        self.load_chunk_bytes = 64 * 1024
+        # Drafts older than this are packed into drafts/.archive (Settings menu).
+        self.archive_after_days = 90
+        self.writer = PersistenceWorker(schedule=self.root.after)
+        self.draft_store = DraftStore("drafts")
+        self.journal = SessionJournal(writer=self.writer, store=self.draft_store)
+        self.keystrokes = KeystrokeRecorder(self.journal.journal_dir, writer=self.writer)
+        self.session = Session(length_minutes=15, counter=self.word_counter, journal=self.journal,
+                               keystrokes=self.keystrokes)
+        self.session_timer = SessionTimer(self.session, self.root.after, self.root.after_cancel)
+        self.session.subscribe("tick", self.show_remaining)
+        self.session.subscribe("started", lambda: self.show_remaining(self.session.remaining()))
+        self.session.subscribe("restarted", lambda: self.show_remaining(self.session.remaining()))
+        self.session.subscribe("times_up", self.times_up)
+        self.timer_label.config(text=f"{self.session.length_minutes}:00")
+        self.recover_session()
+        self.startup.mark("recover")
+        self.autosaver = Autosaver(self.autosave, self.root.after, self.root.after_cancel,
+                                   idle_ms=self.autosave_idle_ms,
+                                   max_latency_ms=self.autosave_max_latency_ms)
+        self.text.bind('<<Modified>>', self.on_text_modified)
         self.text.focus_set()
+        self.startup.mark("session")
+        # Anything not needed to type waits until the editor has painted.
+        self.root.after_idle(lambda: self.root.after(0, self.finish_startup))
+
+    def finish_startup(self):
+        self.startup.mark("first paint")
+        self.archive_old_drafts()
+
+    def archive_old_drafts(self):
+        days = self.archive_after_days
+        self.writer.call(lambda: self.draft_store.archive_older_than(days),
+                         on_error=lambda e: print(f"Archiving drafts failed: {e}"))
 
     def create_menu(self):
+        # Only the cascades exist at startup; each menu is filled in the
+        # first time it is opened.
         menubar = tk.Menu(self.root)
-        file_menu = tk.Menu(menubar, tearoff=0)
+        for label, fill in (("File", self.fill_file_menu), ("Format", self.fill_format_menu),
+                            ("Settings", self.fill_settings_menu), ("Help", self.fill_help_menu)):
+            menu = tk.Menu(menubar, tearoff=0)
+            menu.configure(postcommand=lambda m=menu, f=fill: self.fill_menu(m, f))
+            menubar.add_cascade(label=label, menu=menu)
+        self.root.config(menu=menubar)
+
+    def fill_menu(self, menu, fill):
+        menu.configure(postcommand="")
+        fill(menu)
+
+    def fill_file_menu(self, file_menu):
         file_menu.add_command(label="New Session", command=self.new_session)
         file_menu.add_command(label="Save", command=self.save_file)
+        file_menu.add_command(label="Export Drafts...", command=self.export_drafts)
+        file_menu.add_command(label="Backup All Drafts...", command=self.backup_all_drafts)
         file_menu.add_command(label="Exit", command=self.exit_app)
-        menubar.add_cascade(label="File", menu=file_menu)
-        format_menu = tk.Menu(menubar, tearoff=0)
+
+    def fill_format_menu(self, format_menu):
         font_menu = tk.Menu(format_menu, tearoff=0)
         for font_name in self.font_styles:
             font_menu.add_command(label=font_name, command=lambda f=font_name: self.change_font(f))
@@ -76,17 +144,17 @@ class FreewriteApp:
             size_menu.add_command(label=str(size), command=lambda s=size: self.change_font_size(s))
         format_menu.add_cascade(label="Size", menu=size_menu)  
         format_menu.add_command(label="Toggle Dark Mode", command=self.toggle_theme)
-        menubar.add_cascade(label="Format", menu=format_menu)
-        settings_menu = tk.Menu(menubar, tearoff=0)
+
+    def fill_settings_menu(self, settings_menu):
         settings_menu.add_command(label="Set Word Goal", command=self.set_word_goal)
         settings_menu.add_command(label="Set Timer", command=self.set_timer)
         settings_menu.add_command(label="Toggle Backspace", command=self.toggle_backspace)
-        menubar.add_cascade(label="Settings", menu=settings_menu)
-        help_menu = tk.Menu(menubar, tearoff=0)
+        settings_menu.add_command(label="Archive Drafts After...", command=self.set_archive_age)
+
+    def fill_help_menu(self, help_menu):
         help_menu.add_command(label="About", command=self.show_about)
         help_menu.add_command(label="Freewriting Guide", command=self.show_guide)
-        menubar.add_cascade(label="Help", menu=help_menu)
-        self.root.config(menu=menubar)
+        help_menu.add_command(label="Diagnostics", command=self.show_diagnostics)
 
     def create_ui_elements(self):
         self.main_container = tk.Frame(self.root, bg="white")
@@ -101,7 +169,7 @@ class FreewriteApp:
         self.text = tk.Text(
             self.text_frame,
             wrap='word',
-            font=(self.font_styles[self.current_font_index], self.current_font_size),
+            font=self.fonts["editor"],
             bg="white",
             fg="black",
             bd=0,
@@ -111,7 +179,10 @@ class FreewriteApp:
             highlightthickness=0
         )
         self.text.pack(expand=True, fill='both')
-        self.text.bind('<KeyRelease>', self.update_word_count)
+        self.word_counter = TextWidgetCounter(self.text)
+        # Long-session mode: old text is elided once nothing can edit it.
+        self.freezer = ParagraphFreezer(self.text, {"font": self.fonts["ui-italic"], "fg": "gray"},
+                                        linespace=self.fonts.metrics("ui-italic")["linespace"])
         self.text.bind('<Key>', self.start_timer_on_typing)
         if self.backspace_disabled:
             self.text.bind('<BackSpace>', self.handle_backspace)
@@ -132,7 +203,7 @@ class FreewriteApp:
         self.size_display = tk.Label(
             self.left_controls, 
             text="18px", 
-            font=("Arial", 12),
+            font=self.fonts["ui"],
             bg="white",
             fg="gray"
         )
@@ -142,7 +213,7 @@ class FreewriteApp:
         self.font_display = tk.Label(
             self.left_controls, 
             text="Lato", 
-            font=("Arial", 12),
+            font=self.fonts["ui"],
             bg="white",
             fg="gray"
         )
@@ -156,7 +227,7 @@ class FreewriteApp:
         self.timer_label = tk.Label(
             self.right_controls, 
             text="15:00", 
-            font=("Arial", 12), 
+            font=self.fonts["ui"], 
             bg="white", 
             fg="gray" 
         )
@@ -166,7 +237,7 @@ class FreewriteApp:
         self.chat_btn = tk.Label(
             self.right_controls,
             text="Chat",  
-            font=("Arial", 12),
+            font=self.fonts["ui"],
             bg="white",
             fg="gray"
         )
@@ -176,7 +247,7 @@ class FreewriteApp:
         self.new_entry_btn = tk.Label(
             self.right_controls, 
             text="New Entry", 
-            font=("Arial", 12),
+            font=self.fonts["ui"],
             bg="white",
             fg="gray"
         )
@@ -186,7 +257,7 @@ class FreewriteApp:
         self.history_btn = tk.Label(
             self.right_controls, 
             text="History", 
-            font=("Arial", 12),
+            font=self.fonts["ui"],
             bg="white",
             fg="gray"
         )
@@ -196,7 +267,7 @@ class FreewriteApp:
         self.theme_btn = tk.Label(
             self.right_controls,  
             text="Theme", 
-            font=("Arial", 12),
+            font=self.fonts["ui"],
             bg="white",
             fg="gray"
         )
@@ -206,6 +277,8 @@ class FreewriteApp:
     def open_chat(self):
         text_content = self.text.get("1.0", 'end-1c').strip()
         if text_content:
+            import webbrowser
+            from urllib.parse import quote
             query = quote(text_content)
             webbrowser.open(f"https://chat.openai.com/?q={query}")  
         else:
@@ -220,38 +293,25 @@ class FreewriteApp:
         self.root.bind('<Control-p>', lambda e: self.toggle_pause())
     
     def start_timer_on_typing(self, event=None):
-        if not self.timer_started and event.char:
-            self.timer_started = True
-            self.running = True
-            self.start_time = time.time()
-            self.update_timer()
+        if not event.char:
+            return
+        self.startup.mark_once("first keystroke")
+        self.session.keystroke()
+        self.session.start()
         
     def start_timer_on_click(self, event=None):
-        if not self.timer_started:
-            self.timer_started = True
-            self.running = True
-            self.start_time = time.time()
-            self.update_timer()
+        self.session.start()
         
-    def update_word_count(self, event=None):
-        text_content = self.text.get("1.0", 'end-1c')
-        words = text_content.split()
-        self.word_count = len(words)
+    @property
+    def word_count(self):
+        # Kept current by the widget's insert/delete calls.
+        return self.session.word_count
 
-    def update_timer(self):
-        if not self.running:
-            return
-        if not self.paused and self.start_time:
-            elapsed_time = int(time.time() - self.start_time)
-            remaining_time = max(0, self.session_length_minutes * 60 - elapsed_time)
-            if remaining_time <= 0 and self.running:
-                self.times_up()
-                return
-            minutes = remaining_time // 60
-            seconds = remaining_time % 60
-            timer_text = f"{minutes:02d}:{seconds:02d}"
-            self.timer_label.config(text=timer_text)
-        self.root.after(1000, self.update_timer)
+    def show_remaining(self, remaining_time):
+        minutes = remaining_time // 60
+        seconds = remaining_time % 60
+        timer_text = f"{minutes:02d}:{seconds:02d}"
+        self.timer_label.config(text=timer_text)
 
     def handle_backspace(self, event):
         if self.backspace_disabled:
@@ -259,41 +319,26 @@ class FreewriteApp:
         return None
 
     def change_font(self, font_name):
-        self.text.config(font=(font_name, self.current_font_size))
+        # The editor and open history windows share this named font.
+        self.fonts.configure("editor", family=font_name)
         self.font_display.config(text=font_name)
 
     def change_font_size(self, size):
         self.current_font_size = size
-        current_font = font.Font(font=self.text["font"])
-        family = current_font.actual()["family"]
-        self.text.config(font=(family, size))
+        self.fonts.configure("editor", size=size)
         self.size_display.config(text=f"{size}px")
 
     def toggle_theme(self):
-        self.current_theme_index = (self.current_theme_index + 1) % len(self.themes)
-        self.apply_theme(self.themes[self.current_theme_index])
-
-    def apply_theme(self, theme):
-        bg_color = theme["bg"]
-        fg_color = theme["fg"]
-        cursor_color = theme["cursor"]
-
-
-        self.root.configure(bg=bg_color)
-        self.main_container.configure(bg=bg_color)
-        self.text_frame.configure(bg=bg_color)
-        self.text.configure(bg=bg_color, fg=fg_color, insertbackground=cursor_color)
-        self.bottom_frame.configure(bg=bg_color)
-        self.left_controls.configure(bg=bg_color)
-        self.right_controls.configure(bg=bg_color)
-        
+        self.apply_theme(self.current_theme_index + 1)
 
-        for widget in [self.size_display, self.font_display, self.timer_label, 
-                      self.chat_btn, self.new_entry_btn, self.history_btn, self.theme_btn]:
-            widget.configure(bg=bg_color, fg=fg_color)
-        
+    def apply_theme(self, index):
+        # Every open window, the history panel included, in one pass.
+        self.current_theme_index = index % len(self.themes)
+        self.theme.apply(self.current_theme_index)
 
-        self.timer_label.configure(font=("Arial", 12), fg=fg_color)
+    def on_theme_applied(self, palette):
+        if hasattr(self, 'history_menu') and self.history_list.canvas.winfo_exists():
+            self.history_list.set_colors(palette)
 
     def show_theme_menu(self):
         theme_menu = tk.Toplevel(self.root)
@@ -302,19 +347,19 @@ class FreewriteApp:
         theme_menu.configure(bg="white")
 
         for index, theme in enumerate(self.themes):
-            theme_button = tk.Button(
+            # Each button previews its own theme, so the engine leaves it be.
+            theme_button = themed(tk.Button(
                 theme_menu,
                 text=theme["name"],
-                font=("Arial", 12),
+                font=self.fonts["ui"],
                 bg=theme["bg"],
                 fg=theme["fg"],
                 command=lambda i=index: self.select_theme(i)
-            )
+            ))
             theme_button.pack(fill=tk.X, padx=10, pady=5)
 
     def select_theme(self, index):
-        self.current_theme_index = index
-        self.apply_theme(self.themes[index])
+        self.apply_theme(index)
 
     def toggle_fullscreen(self, event=None):
         is_fullscreen = self.root.attributes('-fullscreen')
@@ -322,27 +367,24 @@ class FreewriteApp:
         return "break"
         
     def toggle_pause(self, event=None):
-        if not self.timer_started:
-            return
-        self.paused = not self.paused
-        if self.paused:
-            self.pause_time = time.time()
-        else:
-            pause_duration = time.time() - self.pause_time
-            self.start_time += pause_duration
+        self.session.toggle_pause()
 
     def toggle_backspace(self):
         self.backspace_disabled = not self.backspace_disabled
         if self.backspace_disabled:
             self.text.bind('<BackSpace>', self.handle_backspace)
+            self.freezer.set_enabled(True)
             messagebox.showinfo("Settings", "Backspace has been disabled.")
         else:
             self.text.unbind('<BackSpace>')
+            # Frozen text must be editable again before backspace can reach it.
+            self.freezer.set_enabled(False)
             messagebox.showinfo("Settings", "Backspace has been enabled.")
 
     def set_word_goal(self):
         try:
-            new_goal = tk.simpledialog.askinteger(
+            from tkinter import simpledialog
+            new_goal = simpledialog.askinteger(
                 "Word Goal", 
                 "Set your word count goal:",
                 minvalue=1, 
@@ -351,47 +393,148 @@ class FreewriteApp:
             )
             if new_goal:
                 self.goal_word_count = new_goal
-                self.update_word_count()
+        except:
+            pass
+
+    def set_archive_age(self):
+        try:
+            from tkinter import simpledialog
+            days = simpledialog.askinteger(
+                "Archive Drafts",
+                "Archive drafts older than (days):",
+                minvalue=1,
+                maxvalue=3650,
+                initialvalue=self.archive_after_days
+            )
+            if days:
+                self.archive_after_days = days
+                self.archive_old_drafts()
         except:
             pass
 
     def set_timer(self):
         try:
-            new_time = tk.simpledialog.askinteger(
+            from tkinter import simpledialog
+            new_time = simpledialog.askinteger(
                 "Timer Setting", 
                 "Set session length (minutes):",
                 minvalue=1, 
                 maxvalue=120,
-                initialvalue=self.session_length_minutes
+                initialvalue=self.session.length_minutes
             )
             if new_time:
-                self.session_length_minutes = new_time
+                self.session.set_length(new_time)
                 self.timer_label.config(text=f"{new_time}:00")
-                if self.timer_started:
-                    self.start_time = time.time()
         except:
             pass
 
     def autosave(self):
         try:
             text_content = self.text.get("1.0", 'end-1c')
-            if not text_content.strip():
-                return
-            if not os.path.exists("drafts"):
-                os.makedirs("drafts")
-            timestamp = datetime.datetime.now().strftime("%Y%m%d-%H%M%S")
-            filename = f'drafts/freewrite_{timestamp}.txt'
-            with open(filename, 'w', encoding='utf-8') as f:
-                f.write(text_content)
+            # Only what changed since the last autosave hits the disk.
+            if self.session.autosave(text_content):
+                self.save_session_state()
+            # Autosave runs in typing pauses, a good moment to freeze.
+            self.freezer.maybe_freeze()
         except Exception as e:
             print(f"Autosave failed: {e}")
 
-    def schedule_autosave(self):
-        if self.running:
-            self.autosave()
-        self.root.after(self.autosave_interval * 1000, self.schedule_autosave)
+    def save_session_state(self):
+        """Point drafts/.session.json at the live journal, for crash restore."""
+        family, size = self.fonts.family("editor"), self.fonts.size("editor")
+        save_state(self.writer, {
+            "journal": self.journal.path,
+            "journal_bytes": self.journal.size,
+            "cursor": self.text.index(tk.INSERT),
+            "timer": self.session.timer_state(),
+            "font": [family, size],
+            "theme": self.current_theme_index,
+        })
+
+    def end_session(self):
+        """Compact the autosave journal into a single draft snapshot."""
+        try:
+            # Edits still waiting for the idle gap go into the journal first.
+            self.autosaver.flush()
+            text_content = self.text.get("1.0", 'end-1c')
+            snapshot = self.session.finish(text_content)
+            clear_state(self.writer)
+            if snapshot:
+                self.index_draft(snapshot, text_content)
+        except Exception as e:
+            print(f"Could not finish session: {e}")
+
+    def get_history_index(self):
+        if not hasattr(self, 'history_index'):
+            from freewrite.history_index import HistoryIndex, HistorySearch
+            self.history_index = HistoryIndex("drafts", store=self.draft_store)
+            self.history_search = HistorySearch(self.history_index, self.root.after)
+        return self.history_index
+
+    def index_draft(self, path, text_content):
+        """Update the history index for a draft once the writer has saved it."""
+        drafts_dir = os.path.abspath("drafts")
+        if os.path.dirname(os.path.abspath(path)) != drafts_dir:
+            return
+        index = self.get_history_index()
+        name = os.path.basename(path)
+        self.writer.call(lambda: index.update_file(name, text_content))
+
+    def recover_session(self):
+        """Restore the text of a session that did not shut down cleanly."""
+        state = load_state()
+        if state and self.restore_session(state):
+            return
+        try:
+            recovered = self.journal.recover()
+        except Exception as e:
+            print(f"Session recovery failed: {e}")
+            return
+        if recovered:
+            self.text.insert("1.0", recovered[-1])
+
+    def restore_session(self, state):
+        """Reopen the session named by the state file exactly where it was."""
+        path = state.get("journal")
+        try:
+            # A journal shorter than the state says was damaged; replay
+            # every journal the slow way instead.
+            if not path or os.path.getsize(path) < state.get("journal_bytes", 0):
+                return False
+            text = self.journal.resume(path)
+        except Exception as e:
+            print(f"Could not restore session: {e}")
+            return False
+        self.text.insert("1.0", text)
+        self.text.mark_set(tk.INSERT, state.get("cursor", tk.END))
+        self.text.see(tk.INSERT)
+        if state.get("font"):
+            family, size = state["font"]
+            # So the next click cycles on from the restored font, not the first.
+            if family in self.font_styles:
+                self.current_font_index = self.font_styles.index(family)
+            if size in self.font_sizes:
+                self.current_font_size_index = self.font_sizes.index(size)
+            self.current_font_size = size
+            self.fonts.configure("editor", family=family, size=size)
+            self.font_display.config(text=family)
+            self.size_display.config(text=f"{size}px")
+        if isinstance(state.get("theme"), int):
+            self.apply_theme(state["theme"])
+        self.session.restore_timer(state.get("timer", {}))
+        self.show_remaining(self.session.remaining())
+        return True
+
+    def on_text_modified(self, event=None):
+        # Clearing the flag re-arms <<Modified>> for the next edit; that
+        # clear fires the event once more, with the flag already off.
+        if not self.text.edit_modified():
+            return
+        self.text.edit_modified(False)
+        self.autosaver.mark_dirty()
 
     def save_file(self):
+        from tkinter import filedialog
         try:
             text_content = self.text.get("1.0", 'end-1c')
             if not text_content.strip():
@@ -404,9 +547,13 @@ class FreewriteApp:
                 title="Save Your Writing"
             )
             if file_path:
-                with open(file_path, 'w', encoding='utf-8') as f:
-                    f.write(text_content)
-                messagebox.showinfo("Save", f"File saved successfully to {file_path}")
+                self.writer.write(
+                    file_path,
+                    text_content,
+                    on_done=lambda p: messagebox.showinfo("Save", f"File saved successfully to {p}"),
+                    on_error=lambda e: messagebox.showerror("Error", f"Could not save file: {e}")
+                )
+                self.index_draft(file_path, text_content)
         except Exception as e:
             messagebox.showerror("Error", f"Could not save file: {e}")
 
@@ -420,27 +567,24 @@ class FreewriteApp:
                 return
             elif response:
                 self.save_file()
+        self.end_session()
+        self.freezer.reset()
         self.text.delete("1.0", tk.END)
-        self.timer_started = False
-        self.running = False
-        self.paused = False
-        self.word_count = 0
-        self.timer_label.config(text=f"{self.session_length_minutes}:00")
+        self.session.reset()
+        self.timer_label.config(text=f"{self.session.length_minutes}:00")
 
     def times_up(self):
-        self.running = False
         self.timer_label.config(text="00:00")
-        self.autosave()
+        self.autosaver.flush()
         result = messagebox.askyesno(
             "Time's Up!", 
-            f"Your {self.session_length_minutes}-minute freewriting session is complete!\n\n"
-            f"You wrote {self.word_count} words.\n\n"
+            f"Your {self.session.length_minutes}-minute freewriting session is complete!\n\n"
+            f"You wrote {self.word_count} words"
+            f" ({self.keystrokes.average_wpm():.0f} wpm).\n\n"
             "Do you want to continue writing?"
         )
         if result:
-            self.start_time = time.time()
-            self.running = True
-            self.update_timer()
+            self.session.extend()
         else:
             self.save_file()
 
@@ -497,7 +641,7 @@ class FreewriteApp:
         guide_area = tk.Text(
             guide_window, 
             wrap=tk.WORD, 
-            font=("Arial", 12),
+            font=self.fonts["ui"],
             padx=20, 
             pady=20
         )
@@ -513,6 +657,55 @@ class FreewriteApp:
         )
         close_button.pack(pady=10)
 
+    def show_diagnostics(self):
+        window = tk.Toplevel(self.root)
+        window.title("Diagnostics")
+        window.geometry("760x460")
+        report_area = tk.Text(window, wrap=tk.NONE, font=self.fonts["mono"], padx=10, pady=10)
+        report_area.pack(expand=True, fill=tk.BOTH)
+
+        def refresh():
+            report_area.config(state=tk.NORMAL)
+            report_area.delete("1.0", tk.END)
+            if not self.instrumentation.enabled:
+                report_area.insert(tk.END, "Callback timing is off.\n\n"
+                                           "Start Freewrite with FREEWRITE_DIAGNOSTICS=1 to record it.")
+            else:
+                report_area.insert(tk.END, f"{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'max ms':>9}{'calls':>8}  callback\n")
+                for name, stats in self.instrumentation.report():
+                    report_area.insert(
+                        tk.END,
+                        f"{stats['p50_ms']:9.2f}{stats['p95_ms']:9.2f}{stats['p99_ms']:9.2f}"
+                        f"{stats['max_ms']:9.2f}{stats['count']:8d}  {name}\n"
+                    )
+            report_area.config(state=tk.DISABLED)
+
+        def reset():
+            self.instrumentation.reset()
+            refresh()
+
+        def save():
+            from tkinter import filedialog
+            path = filedialog.asksaveasfilename(
+                defaultextension=".json",
+                filetypes=[("JSON", "*.json")],
+                initialfile="freewrite-diagnostics.json",
+                title="Save Diagnostics"
+            )
+            if path:
+                try:
+                    self.instrumentation.dump(path)
+                except Exception as e:
+                    messagebox.showerror("Error", f"Could not save diagnostics: {e}")
+
+        button_row = tk.Frame(window)
+        button_row.pack(pady=10)
+        for label, command in (("Refresh", refresh), ("Reset", reset), ("Save JSON...", save),
+                               ("Close", window.destroy)):
+            state = tk.NORMAL if self.instrumentation.enabled or label == "Close" else tk.DISABLED
+            tk.Button(button_row, text=label, command=command, padx=10, pady=5, state=state).pack(side=tk.LEFT, padx=5)
+        refresh()
+
     def exit_app(self):
         """Ensure proper cleanup before exiting the application."""
         if self.word_count > 0:
@@ -525,6 +718,14 @@ class FreewriteApp:
             elif response: 
                 self.save_file()
         
+        self.end_session()
+        # Wait for queued saves so nothing is lost on the way out.
+        self.writer.close(timeout=10)
+        if self.instrumentation.enabled:
+            try:
+                self.instrumentation.dump()
+            except Exception as e:
+                print(f"Could not write diagnostics: {e}")
         self.root.unbind_all("<MouseWheel>")
         self.root.destroy()
 
@@ -536,28 +737,25 @@ class FreewriteApp:
     def cycle_fonts(self, event=None):
         self.current_font_index = (self.current_font_index + 1) % len(self.font_styles)
         new_font = self.font_styles[self.current_font_index]
-        self.text.config(font=(new_font, self.current_font_size))
+        self.fonts.configure("editor", family=new_font)
         self.font_display.config(text=new_font)
 
     def cycle_font_sizes(self, event=None):
         self.current_font_size_index = (self.current_font_size_index + 1) % len(self.font_sizes)
         new_size = self.font_sizes[self.current_font_size_index]
         self.current_font_size = new_size
-        self.text.config(font=(self.font_styles[self.current_font_index], new_size))
+        self.fonts.configure("editor", size=new_size)
         self.size_display.config(text=f"{new_size}px")
 
     def show_history(self):
         history_window = tk.Toplevel(self.root)
         history_window.title("Freewrite History")
         history_window.geometry("300x400")
-        history_window.configure(bg="white")
 
         history_label = tk.Label(
             history_window, 
             text="Select a file to view:", 
-            font=("Arial", 14), 
-            bg="white", 
-            fg="black"
+            font=self.fonts["label"]
         )
         history_label.pack(pady=10)
 
@@ -565,29 +763,39 @@ class FreewriteApp:
         if not os.path.exists(drafts_dir):
             os.makedirs(drafts_dir)
 
-        files = sorted(
-            [f for f in os.listdir(drafts_dir) if f.endswith(".txt")], 
-            reverse=True
+        from freewrite.history_index import PAGE_SIZE, iter_drafts
+        files = iter_drafts(drafts_dir, self.draft_store)
+        files_frame = tk.Frame(history_window)
+        files_frame.pack(fill=tk.X)
+
+        def show_page():
+            shown = 0
+            for entry in itertools.islice(files, PAGE_SIZE):
+                shown += 1
+                file_button = tk.Button(
+                    files_frame,
+                    text=entry.name,
+                    font=self.fonts["ui"],
+                    anchor="w",
+                    command=lambda f=entry.name: self.open_history_file(f)
+                )
+                file_button.pack(fill=tk.X, padx=10, pady=5)
+            if shown < PAGE_SIZE:
+                more_button.pack_forget()
+
+        more_button = tk.Button(
+            history_window,
+            text="Show more",
+            font=self.fonts["ui"],
+            command=show_page
         )
-
-        for file in files:
-            file_button = tk.Button(
-                history_window,
-                text=file,
-                font=("Arial", 12),
-                bg="white",
-                fg="black",
-                anchor="w",
-                command=lambda f=file: self.open_history_file(f)
-            )
-            file_button.pack(fill=tk.X, padx=10, pady=5)
+        more_button.pack(pady=5)
+        show_page()
 
         close_button = tk.Button(
             history_window, 
             text="Close", 
-            font=("Arial", 12), 
-            bg="white", 
-            fg="black", 
+            font=self.fonts["ui"], 
             command=history_window.destroy
         )
         close_button.pack(pady=10)
@@ -600,13 +808,14 @@ class FreewriteApp:
 
     def open_history_menu(self):
 
-        current_theme = self.themes[self.current_theme_index]
-        bg_color = current_theme["bg"]
-        fg_color = current_theme["fg"]
-        accent_color = current_theme["cursor"]
+        palette = self.theme.palette
+        bg_color = palette["bg"]
+        fg_color = palette["fg"]
+        accent_color = palette["accent"]
         
         self.history_menu = tk.Frame(self.root, bg=bg_color, width=350, borderwidth=0, 
                                      highlightthickness=1, highlightbackground=accent_color)
+        themed(self.history_menu, background="bg", highlightbackground="accent")
         self.history_menu.place(x=self.root.winfo_width(), y=0, height=self.root.winfo_height())
         
 
@@ -616,7 +825,7 @@ class FreewriteApp:
         history_label = tk.Label(
             header_frame, 
             text="Writing History", 
-            font=("Arial", 18, "bold"), 
+            font=self.fonts["title"], 
             bg=bg_color, 
             fg=fg_color
         )
@@ -625,11 +834,12 @@ class FreewriteApp:
         close_btn = tk.Label(
             header_frame, 
             text="×", 
-            font=("Arial", 22), 
+            font=self.fonts["close"], 
             bg=bg_color, 
             fg=accent_color,
             cursor="hand2"
         )
+        themed(close_btn, background="bg", foreground="accent")
         close_btn.pack(side=tk.RIGHT)
         close_btn.bind("<Button-1>", lambda e: self.close_history_menu())
         
@@ -637,7 +847,8 @@ class FreewriteApp:
         search_frame = tk.Frame(self.history_menu, bg=bg_color, padx=20, pady=10)
         search_frame.pack(fill=tk.X)
         
-        search_border = tk.Frame(search_frame, bg=accent_color, padx=1, pady=1, borderwidth=0)
+        search_border = themed(tk.Frame(search_frame, bg=accent_color, padx=1, pady=1, borderwidth=0),
+                               background="accent")
         search_border.pack(fill=tk.X)
         
         search_inner = tk.Frame(search_border, bg=bg_color, borderwidth=0)
@@ -645,7 +856,7 @@ class FreewriteApp:
         
         self.search_entry = tk.Entry(
             search_inner,
-            font=("Arial", 12),
+            font=self.fonts["ui"],
             bg=bg_color,
             fg=fg_color,
             insertbackground=accent_color,
@@ -662,31 +873,25 @@ class FreewriteApp:
         self.search_entry.bind("<KeyRelease>", self.filter_history_entries)
         
 
-        divider = tk.Frame(self.history_menu, height=1, bg=accent_color)
+        divider = themed(tk.Frame(self.history_menu, height=1, bg=accent_color), background="accent")
         divider.pack(fill=tk.X, padx=20, pady=10)
 
         self.files_scroll_frame = tk.Frame(self.history_menu, bg=bg_color)
         self.files_scroll_frame.pack(fill=tk.BOTH, expand=True, padx=0, pady=0)
         
-        self.files_canvas = tk.Canvas(self.files_scroll_frame, bg=bg_color, 
-                                      highlightthickness=0, borderwidth=0)
-        self.files_canvas.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
-        
-        scrollbar = tk.Scrollbar(self.files_scroll_frame, orient="vertical", 
-                                 command=self.files_canvas.yview)
-        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
-        
-        self.files_canvas.configure(yscrollcommand=scrollbar.set)
-        
-        self.files_frame = tk.Frame(self.files_canvas, bg=bg_color)
-        canvas_window = self.files_canvas.create_window((0, 0), window=self.files_frame, 
-                                                        anchor="nw", tags="self.files_frame")
-        
-        def configure_canvas(event):
-            self.files_canvas.configure(scrollregion=self.files_canvas.bbox("all"))
-            self.files_canvas.itemconfig(canvas_window, width=event.width)
-        
-        self.files_frame.bind("<Configure>", configure_canvas)
+        # Only the rows in view exist as widgets; they are reused on scroll.
+        from freewrite.history_list import HistoryList
+        self.history_list = HistoryList(
+            self.files_scroll_frame,
+            {"bg": bg_color, "fg": fg_color, "accent": accent_color, "hover": palette["hover"]},
+            self.open_history_file,
+            on_more=self.load_more_history,
+            fonts={"date": self.fonts["ui-bold"], "words": self.fonts["ui-small"],
+                   "preview": self.fonts["preview"], "empty": self.fonts["ui-italic"]},
+            metrics={"date": self.fonts.metrics("ui-bold"), "words": self.fonts.metrics("ui-small"),
+                     "preview": self.fonts.metrics("preview")}
+        )
+        self.files_canvas = self.history_list.canvas
         
         def _on_mousewheel(event):
             self.files_canvas.yview_scroll(int(-1*(event.delta/120)), "units")
@@ -697,12 +902,12 @@ class FreewriteApp:
         def _cleanup_bindings():
             if hasattr(self, 'files_canvas'):
                 self.files_canvas.unbind_all("<MouseWheel>")
-                self.files_frame.unbind("<Configure>")
         
         self.history_menu.bind("<Destroy>", lambda e: _cleanup_bindings())
         
 
         self.load_history_files()
+        self.start_drafts_watcher()
         
 
         button_frame = tk.Frame(self.history_menu, bg=bg_color, padx=20, pady=15)
@@ -711,7 +916,7 @@ class FreewriteApp:
         new_session_btn = tk.Button(
             button_frame,
             text="New Session",
-            font=("Arial", 12),
+            font=self.fonts["ui"],
             bg=accent_color,
             fg=bg_color,
             activebackground=fg_color,
@@ -723,6 +928,8 @@ class FreewriteApp:
             cursor="hand2",
             command=self.start_new_session_from_history
         )
+        themed(new_session_btn, background="accent", foreground="bg",
+               activebackground="fg", activeforeground="bg")
         new_session_btn.pack(side=tk.RIGHT)
         
 
@@ -740,150 +947,92 @@ class FreewriteApp:
             self.close_history_menu()
         self.new_session()
 
-    def load_history_files(self):
-        for widget in self.files_frame.winfo_children():
-            widget.destroy()
-        
-        drafts_dir = "drafts"
-        if not os.path.exists(drafts_dir):
-            os.makedirs(drafts_dir)
-        
-      
-        files = sorted(
-            [f for f in os.listdir(drafts_dir) if f.endswith(".txt")], 
-            reverse=True
-        )
-        
+    def get_search_query(self):
         search_query = ""
         if hasattr(self, 'search_entry'):
             search_query = self.search_entry.get().lower()
             if search_query == "search entries...":
                 search_query = ""
-        
+        return search_query
 
-        if search_query:
-            filtered_files = []
-            for file in files:
-                with open(os.path.join(drafts_dir, file), 'r', encoding='utf-8') as f:
-                    try:
-                        content = f.read()
-                        if search_query in content.lower() or search_query in file.lower():
-                            filtered_files.append(file)
-                    except:
-                        pass  
-            files = filtered_files
-        
-        if not files:
-            no_files_label = tk.Label(
-                self.files_frame,
-                text="No entries found",
-                font=("Arial", 12, "italic"),
-                bg=self.themes[self.current_theme_index]["bg"],
-                fg=self.themes[self.current_theme_index]["fg"]
-            )
-            no_files_label.pack(pady=20)
-            return
-        
+    def load_history_files(self):
+        """Refresh the index and list entries; the work runs off the Tk thread."""
+        self.get_history_index()
+        self.last_search_query = self.get_search_query()
+        self.history_search.submit(self.last_search_query, self.render_history_entries, refresh=True)
 
-        for file in files:
-            current_theme = self.themes[self.current_theme_index]
-            bg_color = current_theme["bg"]
-            fg_color = current_theme["fg"]
-            accent_color = current_theme["cursor"]
-            
-           
-            try:
-                date_str = file.replace("freewrite_", "").replace(".txt", "")
-                date_obj = datetime.datetime.strptime(date_str, "%Y%m%d-%H%M%S")
-                formatted_date = date_obj.strftime("%B %d, %Y at %I:%M %p")
-            except:
-                formatted_date = file
-            
-
-            preview_text = ""
-            try:
-                with open(os.path.join(drafts_dir, file), 'r', encoding='utf-8') as f:
-                    content = f.read()
-                    words = content.split()
-                    word_count = len(words)
-                    preview_text = content[:100] + ("..." if len(content) > 100 else "")
-            except:
-                preview_text = "Error reading file"
-                word_count = 0
-
-            entry_frame = tk.Frame(
-                self.files_frame,
-                bg=bg_color,
-                padx=20,
-                pady=12,
-                borderwidth=0
-            )
-            entry_frame.pack(fill=tk.X)
-            entry_frame.bind("<Enter>", lambda e, f=entry_frame: f.configure(bg=self.lighten_color(bg_color)))
-            entry_frame.bind("<Leave>", lambda e, f=entry_frame: f.configure(bg=bg_color))
-            entry_frame.bind("<Button-1>", lambda e, f=file: self.open_history_file(f))
-            
-
-            date_label = tk.Label(
-                entry_frame,
-                text=formatted_date,
-                font=("Arial", 12, "bold"),
-                bg=entry_frame["bg"],
-                fg=fg_color,
-                anchor="w"
-            )
-            date_label.pack(fill=tk.X, anchor="w")
-            date_label.bind("<Button-1>", lambda e, f=file: self.open_history_file(f))
-            
-            word_label = tk.Label(
-                entry_frame,
-                text=f"{word_count} words",
-                font=("Arial", 10),
-                bg=entry_frame["bg"],
-                fg=accent_color,
-                anchor="w"
-            )
-            word_label.pack(fill=tk.X, anchor="w", pady=(2, 5))
-            word_label.bind("<Button-1>", lambda e, f=file: self.open_history_file(f))
-            
-
-            preview_label = tk.Label(
-                entry_frame,
-                text=preview_text,
-                font=("Arial", 11),
-                bg=entry_frame["bg"],
-                fg=fg_color,
-                anchor="w",
-                justify=tk.LEFT,
-                wraplength=280
-            )
-            preview_label.pack(fill=tk.X, anchor="w")
-            preview_label.bind("<Button-1>", lambda e, f=file: self.open_history_file(f))
-            
+    def load_more_history(self, offset):
+        self.history_search.submit(self.last_search_query, self.append_history_entries, offset=offset)
 
-            if file != files[-1]:
-                divider = tk.Frame(self.files_frame, height=1, bg=accent_color)
-                divider.pack(fill=tk.X, padx=20, pady=0)
+    def render_history_entries(self, entries):
+        if not hasattr(self, 'history_menu') or not self.files_canvas.winfo_exists():
+            return
+        from freewrite.history_index import PAGE_SIZE
+        self.history_list.set_records(entries, has_more=len(entries) == PAGE_SIZE)
 
-    def filter_history_entries(self, event=None):
-        self.load_history_files()
+    def append_history_entries(self, entries):
+        if not hasattr(self, 'history_menu') or not self.files_canvas.winfo_exists():
+            return
+        from freewrite.history_index import PAGE_SIZE
+        self.history_list.add_records(entries, has_more=len(entries) == PAGE_SIZE)
+
+    def start_drafts_watcher(self):
+        """Keep the open panel current as drafts are added, changed or removed."""
+        from freewrite.watcher import DraftsWatcher
+        self.stop_drafts_watcher()
+        self.drafts_watcher = DraftsWatcher("drafts", self.root.after, self.on_drafts_changed)
+        self.drafts_watcher.start()
+
+    def stop_drafts_watcher(self):
+        if getattr(self, 'drafts_watcher', None):
+            self.drafts_watcher.stop()
+            self.drafts_watcher = None
+
+    def on_drafts_changed(self, events):
+        """Re-index just the drafts in a coalesced batch, then patch their rows."""
+        if not hasattr(self, 'history_menu'):
+            return
+        if any(kind == "rescan" for kind, name in events):
+            self.load_history_files()
+            return
+        index = self.get_history_index()
+        names = [name for kind, name in events]
 
-    def lighten_color(self, hex_color, factor=0.1):
-        """Lighten a hex color by a factor (0.0-1.0)"""
-        try:
+        def update():
+            # Missing files are dropped from the index; entry() is then None.
+            for name in names:
+                index.update_file(name)
+            return [(name, index.entry(name)) for name in names]
 
-            hex_color = hex_color.lstrip('#')
-            r, g, b = int(hex_color[0:2], 16), int(hex_color[2:4], 16), int(hex_color[4:6], 16)
-            
-            # Lighten
-            r = min(255, int(r + (255 - r) * factor))
-            g = min(255, int(g + (255 - g) * factor))
-            b = min(255, int(b + (255 - b) * factor))
-            
+        self.writer.call(update, on_done=self.patch_history_entries,
+                         on_error=lambda e: print(f"History update failed: {e}"))
 
-            return f'#{r:02x}{g:02x}{b:02x}'
-        except:
-            return hex_color  
+    def patch_history_entries(self, changes):
+        if not hasattr(self, 'history_menu') or not self.files_canvas.winfo_exists():
+            return
+        # Search results are ranked, not listed by name.
+        ordered = not self.last_search_query
+        for name, record in changes:
+            if record is None:
+                self.history_list.remove(name, ordered)
+            else:
+                self.history_list.upsert(record, ordered)
+
+    def filter_history_entries(self, event=None):
+        """Debounce search keystrokes; only the last query in a burst runs."""
+        if getattr(self, 'search_after_id', None):
+            self.root.after_cancel(self.search_after_id)
+        self.search_after_id = self.root.after(self.search_debounce_ms, self.run_history_search)
+
+    def run_history_search(self):
+        self.search_after_id = None
+        if not hasattr(self, 'history_menu'):
+            return
+        search_query = self.get_search_query()
+        if search_query == getattr(self, 'last_search_query', None):
+            return
+        self.last_search_query = search_query
+        self.history_search.submit(search_query, self.render_history_entries)
 
     def animate_history_menu_in(self):
         def slide_in():
@@ -900,6 +1049,13 @@ class FreewriteApp:
         slide_in()
 
     def close_history_menu(self):
+        self.stop_drafts_watcher()
+        if getattr(self, 'search_after_id', None):
+            self.root.after_cancel(self.search_after_id)
+            self.search_after_id = None
+        if hasattr(self, 'history_search'):
+            self.history_search.cancel()
+
         def slide_out():
             x = self.history_menu.winfo_x()
             if x < self.root.winfo_width():
@@ -916,21 +1072,19 @@ class FreewriteApp:
 
     def open_history_file(self, file_name):
         """Open a history file in a new window with improved styling"""
-        drafts_dir = "drafts"
-        file_path = os.path.join(drafts_dir, file_name)
-        
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                content = f.read()
+            # Big drafts are streamed into the window after it has painted.
+            large = self.draft_store.stat(file_name).st_size > self.large_file_bytes
+            content = None if large else self.draft_store.read(file_name)
         except:
             messagebox.showerror("Error", f"Could not open file: {file_name}")
             return
         
 
-        current_theme = self.themes[self.current_theme_index]
-        bg_color = current_theme["bg"]
-        fg_color = current_theme["fg"]
-        accent_color = current_theme["cursor"]
+        palette = self.theme.palette
+        bg_color = palette["bg"]
+        fg_color = palette["fg"]
+        accent_color = palette["accent"]
 
         content_window = tk.Toplevel(self.root)
         content_window.title(f"Freewrite - {file_name}")
@@ -939,7 +1093,7 @@ class FreewriteApp:
         content_window.configure(bg=bg_color)
         
         # Get word count
-        word_count = len(content.split())
+        word_count = None if large else len(content.split())
         
 
         try:
@@ -956,7 +1110,7 @@ class FreewriteApp:
         date_label = tk.Label(
             header_frame,
             text=formatted_date,
-            font=("Arial", 16, "bold"),
+            font=self.fonts["heading"],
             bg=bg_color,
             fg=fg_color
         )
@@ -964,15 +1118,16 @@ class FreewriteApp:
         
         stats_label = tk.Label(
             header_frame,
-            text=f"{word_count} words",
-            font=("Arial", 14),
+            text="Counting words..." if large else f"{word_count} words",
+            font=self.fonts["label"],
             bg=bg_color,
             fg=accent_color
         )
+        themed(stats_label, background="bg", foreground="accent")
         stats_label.pack(side=tk.RIGHT)
         
 
-        divider = tk.Frame(content_window, height=1, bg=accent_color)
+        divider = themed(tk.Frame(content_window, height=1, bg=accent_color), background="accent")
         divider.pack(fill=tk.X, padx=30, pady=5)
         
 
@@ -985,7 +1140,7 @@ class FreewriteApp:
         content_area = tk.Text(
             content_frame,
             wrap=tk.WORD,
-            font=(self.font_styles[self.current_font_index], self.current_font_size),
+            font=self.fonts["editor"],
             bg=bg_color,
             fg=fg_color,
             borderwidth=0,
@@ -997,7 +1152,11 @@ class FreewriteApp:
         content_area.pack(expand=True, fill=tk.BOTH)
         scrollbar.config(command=content_area.yview)
         
-        content_area.insert(tk.END, content)
+        if large:
+            self.stream_into_text(file_name, content_area)
+            self.count_words_in_background(file_name, stats_label)
+        else:
+            content_area.insert(tk.END, content)
         content_area.config(state=tk.DISABLED)
         
 
@@ -1007,20 +1166,22 @@ class FreewriteApp:
         edit_button = tk.Button(
             button_frame,
             text="Edit Text",
-            font=("Arial", 12),
+            font=self.fonts["ui"],
             bg=accent_color,
             fg=bg_color,
             relief=tk.FLAT,
             padx=15,
             pady=8,
-            command=lambda: self.load_text_for_editing(content, content_window)
+            command=lambda: self.load_text_for_editing(
+                self.draft_store.read(file_name) if large else content, content_window)
         )
+        themed(edit_button, background="accent", foreground="bg")
         edit_button.pack(side=tk.LEFT, padx=5)
         
         export_button = tk.Button(
             button_frame,
             text="Export",
-            font=("Arial", 12),
+            font=self.fonts["ui"],
             bg=bg_color,
             fg=accent_color,
             relief=tk.FLAT,
@@ -1028,14 +1189,15 @@ class FreewriteApp:
             highlightbackground=accent_color,
             padx=15,
             pady=8,
-            command=lambda: self.export_file(file_path)
+            command=lambda: self.export_file(file_name)
         )
+        themed(export_button, background="bg", foreground="accent", highlightbackground="accent")
         export_button.pack(side=tk.LEFT, padx=5)
         
         close_button = tk.Button(
             button_frame,
             text="Close",
-            font=("Arial", 12),
+            font=self.fonts["ui"],
             bg=bg_color,
             fg=fg_color,
             relief=tk.FLAT,
@@ -1045,6 +1207,68 @@ class FreewriteApp:
         )
         close_button.pack(side=tk.RIGHT, padx=5)
 
+    def stream_into_text(self, file_name, text_widget):
+        """Insert a draft into a read-only Text widget one chunk per idle slot."""
+        chunks = self.draft_store.iter_chunks(file_name, self.load_chunk_bytes)
+
+        def insert_next():
+            if not text_widget.winfo_exists():
+                chunks.close()
+                return
+            try:
+                chunk = next(chunks)
+            except StopIteration:
+                return
+            except Exception as e:
+                print(f"Could not load {file_name}: {e}")
+                return
+            text_widget.config(state=tk.NORMAL)
+            text_widget.insert(tk.END, chunk)
+            text_widget.config(state=tk.DISABLED)
+            self.root.after_idle(insert_next)
+
+        self.root.after_idle(insert_next)
+
+    def run_in_background(self, func, on_done=None, on_error=None, on_poll=None):
+        """Run func() on its own thread; callbacks run on the Tk thread."""
+        outcome = []
+
+        def work():
+            try:
+                outcome.append((True, func()))
+            except Exception as e:
+                outcome.append((False, e))
+
+        def check():
+            if on_poll:
+                on_poll()
+            if not outcome:
+                self.root.after(50, check)
+                return
+            ok, value = outcome[0]
+            callback = on_done if ok else on_error
+            if callback:
+                callback(value)
+
+        threading.Thread(target=work, daemon=True).start()
+        self.root.after(50, check)
+
+    def count_words_in_background(self, file_name, label):
+        """Count a draft's words on a worker thread and show the result in label."""
+        def show(text):
+            if label.winfo_exists():
+                label.config(text=text)
+
+        def failed(e):
+            print(f"Could not count words in {file_name}: {e}")
+            show("? words")
+
+        self.run_in_background(
+            lambda: count_words_stream(self.draft_store.iter_chunks(file_name)),
+            on_done=lambda count: show(f"{count} words"),
+            on_error=failed
+        )
+
     def load_text_for_editing(self, content, parent_window=None):
         """Loads text from history into the main editor and closes history windows"""
         if parent_window:
@@ -1063,33 +1287,133 @@ class FreewriteApp:
                 return
         
 
+        self.freezer.reset()
         self.text.delete("1.0", tk.END)
         self.text.insert(tk.END, content)
-        self.update_word_count()
+        # Loading is not an edit; only typing should arm the autosaver.
+        self.text.edit_modified(False)
 
-    def export_file(self, source_path):
-        """Export a file to a user-selected location"""
+    def export_file(self, file_name):
+        """Export a draft (plain, stored or archived) to a user-selected location"""
+        from tkinter import filedialog
+        from freewrite.export import export_draft
         target_path = filedialog.asksaveasfilename(
             defaultextension=".txt",
             filetypes=[
                 ("Text files", "*.txt"),
                 ("Markdown files", "*.md"),
+                ("HTML files", "*.html"),
+                ("JSON Lines files", "*.jsonl"),
                 ("All files", "*.*")
             ],
             title="Export File"
         )
         
         if target_path:
+            self.run_in_background(
+                lambda: export_draft(self.draft_store, file_name, target_path),
+                on_done=lambda p: messagebox.showinfo("Export Successful", f"File exported to {p}"),
+                on_error=lambda e: messagebox.showerror("Export Failed", f"Error exporting file: {e}")
+            )
+
+    def export_drafts(self):
+        """Export every draft in a date range into one zip or JSON Lines file"""
+        from tkinter import filedialog, simpledialog
+        from freewrite.export import drafts_between, export_batch
+        from freewrite.history_index import iter_drafts
+        dates = []
+        for prompt in ("From date (YYYY-MM-DD, blank for the first draft):",
+                       "To date (YYYY-MM-DD, blank for today):"):
+            value = simpledialog.askstring("Export Drafts", prompt)
+            if value is None:
+                return
             try:
-                with open(source_path, 'r', encoding='utf-8') as src:
-                    content = src.read()
-                
-                with open(target_path, 'w', encoding='utf-8') as dst:
-                    dst.write(content)
-                
-                messagebox.showinfo("Export Successful", f"File exported to {target_path}")
-            except Exception as e:
-                messagebox.showerror("Export Failed", f"Error exporting file: {e}")
+                dates.append(datetime.datetime.strptime(value.strip(), "%Y-%m-%d").date()
+                             if value.strip() else None)
+            except ValueError:
+                messagebox.showerror("Export Drafts", f"Not a date: {value}")
+                return
+        target_path = filedialog.asksaveasfilename(
+            defaultextension=".zip",
+            filetypes=[
+                ("Zip of Markdown files", "*.zip"),
+                ("JSON Lines files", "*.jsonl")
+            ],
+            title="Export Drafts"
+        )
+        if not target_path:
+            return
+
+        def work(progress):
+            names = drafts_between(iter_drafts("drafts", self.draft_store), dates[0], dates[1])
+            return export_batch(self.draft_store, names, target_path, fmt="md", progress=progress)
+
+        self.run_with_progress(
+            "Export Drafts", work,
+            lambda count: messagebox.showinfo("Export Successful", f"Exported {count} drafts to {target_path}")
+        )
+
+    def backup_all_drafts(self):
+        """Back up every draft, or only those changed since the last backup, to one .tar.gz"""
+        from tkinter import filedialog
+        from freewrite.backup import backup_drafts, load_manifest
+        target_path = filedialog.asksaveasfilename(
+            defaultextension=".tar.gz",
+            filetypes=[("Compressed archives", "*.tar.gz")],
+            initialfile=f"freewrite-backup-{datetime.date.today():%Y%m%d}.tar.gz",
+            title="Backup All Drafts"
+        )
+        if not target_path:
+            return
+        manifest_path = os.path.join("drafts", ".last_backup.json")
+        incremental = False
+        if os.path.exists(manifest_path):
+            incremental = messagebox.askyesnocancel(
+                "Backup All Drafts",
+                "Only include drafts that changed since the last backup?"
+            )
+            if incremental is None:
+                return
+
+        def work(progress):
+            base = load_manifest(manifest_path) if incremental else None
+            manifest = backup_drafts(target_path, self.draft_store, base_manifest=base, progress=progress)
+            atomic_write(manifest_path, json.dumps(manifest))
+            return sum(1 for draft in manifest["drafts"].values() if draft["included"])
+
+        self.run_with_progress(
+            "Backup All Drafts", work,
+            lambda count: messagebox.showinfo("Backup Complete", f"Backed up {count} drafts to {target_path}")
+        )
+
+    def run_with_progress(self, title, work, on_done):
+        """Run work(progress) in the background behind a small progress window."""
+        progress_window = tk.Toplevel(self.root)
+        progress_window.title(title)
+        progress_label = tk.Label(progress_window, text="Collecting drafts...", font=self.fonts["ui"],
+                                  padx=30, pady=20)
+        progress_label.pack()
+        state = [0, 0]
+
+        def progress(done, total):
+            state[:] = [done, total]
+
+        def show_progress():
+            if state[1] and progress_window.winfo_exists():
+                progress_label.config(text=f"{state[0]} of {state[1]} drafts...")
+
+        def finished(result):
+            if progress_window.winfo_exists():
+                progress_window.destroy()
+            on_done(result)
+
+        def failed(e):
+            if progress_window.winfo_exists():
+                progress_window.destroy()
+            messagebox.showerror(title, f"{title} failed: {e}")
+
+        self.run_in_background(lambda: work(progress), on_done=finished, on_error=failed,
+                               on_poll=show_progress)
 
 if __name__ == "__main__":
     root = tk.Tk()
@@ -1097,7 +1421,8 @@ if __name__ == "__main__":
         app.exit_app()
     root.protocol("WM_DELETE_WINDOW", on_closing)
     app = FreewriteApp(root)
-    app.text.insert(tk.END, """Hi. Welcome to Freewrite :)
+    if not app.text.get("1.0", 'end-1c'):
+        app.text.insert(tk.END, """Hi. Welcome to Freewrite :)
 Plz read this guide.
 
 I beg of you.
@@ -1125,4 +1450,7 @@ This is a fork of Farza's original Freewrite app!
 - Paramveer :) 
 
 """)
+        # The welcome text is not the user's writing; don't autosave or count it.
+        app.text.edit_modified(False)
+        app.word_counter.reset()
     root.mainloop()
\ No newline at end of file
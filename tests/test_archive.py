@@ -0,0 +1,35 @@
+import os
+
+import pytest
+
+from freewrite.archive import DraftArchive
+from freewrite.draft_store import DraftStore
+
+
+def test_failed_add_leaves_existing_archive_intact(tmp_path):
+    source = tmp_path / "a.txt"
+    source.write_text("kept", encoding="utf-8")
+    archive = DraftArchive(str(tmp_path))
+    archive.add("2020-01", [("freewrite_20200101-000000.txt", str(source))])
+    with pytest.raises(FileNotFoundError):
+        archive.add("2020-01", [("freewrite_20200102-000000.txt", str(tmp_path / "missing.txt"))])
+    assert os.listdir(archive.archive_dir) == ["2020-01.zip"]
+    reopened = DraftArchive(str(tmp_path))
+    with reopened.open("freewrite_20200101-000000.txt") as f:
+        assert f.read() == b"kept"
+
+
+def test_sweep_archives_only_named_drafts(tmp_path):
+    drafts = tmp_path / "drafts"
+    drafts.mkdir()
+    (drafts / "freewrite_20200101-000000.txt").write_text("old", encoding="utf-8")
+    (drafts / "freewrite_20200101-000000.keys").write_text("", encoding="utf-8")
+    (drafts / "notes.txt").write_text("mine", encoding="utf-8")
+    os.utime(drafts / "notes.txt", (0, 0))
+    store = DraftStore(str(drafts))
+    assert store.archive_older_than(90) == 1
+    assert sorted(os.listdir(drafts)) == [".archive", "notes.txt"]
+
+
+def test_sweep_without_drafts_dir_does_nothing(tmp_path):
+    assert DraftStore(str(tmp_path / "drafts")).archive_older_than(90) == 0
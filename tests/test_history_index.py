@@ -0,0 +1,34 @@
+from freewrite import history_index
+from freewrite.history_index import HistoryIndex
+
+
+def make_drafts(directory, texts):
+    for i, text in enumerate(texts):
+        (directory / f"freewrite_20240101-{i:06d}.txt").write_text(text, encoding="utf-8")
+
+
+def test_common_query_lists_newest_first(tmp_path, monkeypatch):
+    monkeypatch.setattr(history_index, "RANK_LIMIT", 3)
+    make_drafts(tmp_path, ["river stone"] * 5)
+    index = HistoryIndex(str(tmp_path))
+    index.refresh()
+    names = [entry.name for entry in index.search("riv")]
+    assert names == sorted(names, reverse=True) and len(names) == 5
+    index.close()
+
+
+def test_selective_query_is_ranked(tmp_path):
+    make_drafts(tmp_path, ["river", "river river river stone", "stone"])
+    index = HistoryIndex(str(tmp_path))
+    index.refresh()
+    names = [entry.name for entry in index.search("riv")]
+    assert names[0] == "freewrite_20240101-000001.txt" and len(names) == 2
+    index.close()
+
+
+def test_single_letter_matches_whole_word(tmp_path):
+    make_drafts(tmp_path, ["a river", "another river"])
+    index = HistoryIndex(str(tmp_path))
+    index.refresh()
+    assert [entry.name for entry in index.search("a riv")] == ["freewrite_20240101-000000.txt"]
+    index.close()
@@ -0,0 +1,76 @@
+import threading
+import time
+
+from freewrite.history_index import PAGE_SIZE, HistoryIndex, HistorySearch
+
+
+def test_new_query_is_not_stuck_behind_refresh(tmp_path):
+    for i in range(200):
+        (tmp_path / f"freewrite_20240101-{i:06d}.txt").write_text(f"river {i}", encoding="utf-8")
+    index = HistoryIndex(str(tmp_path))
+    started = threading.Event()
+    release = threading.Event()
+    store = index._store
+
+    def slow_store(*args):
+        started.set()
+        release.wait(0.05)
+        store(*args)
+
+    index._store = slow_store
+    search = HistorySearch(index, lambda ms, func: None)
+    search.submit("", lambda entries: None, refresh=True)
+    assert started.wait(2)
+    search.submit("river", lambda entries: None)
+
+    def answered():
+        result = search._result
+        return result is not None and result[0] == search.generation
+
+    deadline = time.monotonic() + 2
+    while not answered() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    # Well before the 200 * 50 ms refresh could have finished.
+    assert answered()
+    release.set()
+
+
+def test_page_that_resumes_a_refresh_is_delivered_once(tmp_path):
+    for i in range(120):
+        (tmp_path / f"freewrite_20240101-{i:06d}.txt").write_text(f"river {i}", encoding="utf-8")
+    index = HistoryIndex(str(tmp_path))
+    started = threading.Event()
+    release = threading.Event()
+    store = index._store
+
+    def slow_store(*args):
+        started.set()
+        release.wait(0.05)
+        store(*args)
+
+    index._store = slow_store
+    entries = index.entries
+    page_reads = []
+
+    def counted_entries(limit, offset=0):
+        if offset:
+            page_reads.append(offset)
+        return entries(limit, offset)
+
+    index.entries = counted_entries
+    scheduled = []
+    search = HistorySearch(index, lambda ms, func: scheduled.append(func))
+    search.submit("", lambda entries: None, refresh=True)
+    assert started.wait(2)
+    pages = []
+    search.submit("", pages.append, offset=PAGE_SIZE)
+    release.set()
+    deadline = time.monotonic() + 5
+    while (scheduled or search._running) and time.monotonic() < deadline:
+        if scheduled:
+            scheduled.pop(0)()
+        time.sleep(0.01)
+    assert not search._stale
+    assert page_reads == [PAGE_SIZE]
+    assert len(pages) == 1
+    assert len(pages[0]) == PAGE_SIZE
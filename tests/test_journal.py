@@ -0,0 +1,28 @@
+import os
+
+import pytest
+
+from freewrite.journal import SessionJournal, replay
+
+
+def test_resume_after_torn_tail_keeps_new_records(tmp_path):
+    journal = SessionJournal(str(tmp_path))
+    journal.append("before the crash")
+    path = journal.path
+    with open(path, 'ab') as f:
+        f.write(b'{"k": 16, "t": " half wri')  # torn by the crash
+
+    resumed = SessionJournal(str(tmp_path))
+    assert resumed.resume(path) == "before the crash"
+    resumed.append("before the crash, and after")
+    assert replay(path) == "before the crash, and after"
+    assert resumed.size == os.path.getsize(path)
+
+
+def test_replay_rejects_corrupt_record_before_the_end(tmp_path):
+    path = tmp_path / "j.jsonl"
+    path.write_bytes(b'{"k": 0, "t": "a"}\ngarbage\n{"k": 1, "t": "b"}\n')
+    with pytest.raises(ValueError):
+        replay(str(path))
+    path.write_bytes(b'{"k": 0, "t": "a"}\n{"k": 1, "t": "b"}\n{"k": 2, "t')
+    assert replay(str(path)) == "ab"
@@ -0,0 +1,76 @@
+import os
+
+from freewrite.core import ManualClock, Session
+from freewrite.draft_store import DraftStore
+from freewrite.journal import SessionJournal
+from freewrite.keystrokes import KeystrokeRecorder, read_keystrokes
+
+
+def finish_session(drafts, text):
+    journal = SessionJournal(str(drafts), store=DraftStore(str(drafts)))
+    recorder = KeystrokeRecorder(journal.journal_dir)
+    journal.append(text)
+    recorder.record()
+    recorder.flush()
+    snapshot = journal.finish(text)
+    recorder.finish(snapshot, stored=lambda: journal.last_stored == snapshot)
+    return snapshot
+
+
+def test_keys_kept_only_for_stored_snapshots(tmp_path):
+    first = finish_session(tmp_path, "same text")
+    assert os.path.exists(os.path.splitext(first)[0] + ".keys")
+    os.rename(os.path.splitext(first)[0] + ".keys", tmp_path / "first.keys")
+    # Identical text is deduplicated by the store, so no draft and no keys.
+    second = finish_session(tmp_path, "same text")
+    assert not os.path.exists(os.path.splitext(second)[0] + ".keys")
+    assert not os.listdir(os.path.join(tmp_path, ".journal"))
+
+
+def test_archiving_a_draft_removes_its_keys(tmp_path):
+    draft = tmp_path / "freewrite_20000101-000000.txt"
+    draft.write_text("old", encoding="utf-8")
+    keys = tmp_path / "freewrite_20000101-000000.keys"
+    keys.write_bytes(b"\0\0\0\0")
+    assert DraftStore(str(tmp_path)).archive_older_than(90) == 1
+    assert not draft.exists() and not keys.exists()
+
+
+def test_recovery_moves_keys_next_to_the_snapshot(tmp_path):
+    journal = SessionJournal(str(tmp_path), store=DraftStore(str(tmp_path)))
+    recorder = KeystrokeRecorder(journal.journal_dir)
+    session = Session(clock=ManualClock(0), journal=journal, keystrokes=recorder)
+    session.start()
+    session.keystroke()
+    assert session.autosave("typed before the crash")
+    recorder.flush()
+    stray = os.path.join(journal.journal_dir, "20000101-000000.keys")
+    open(stray, 'wb').close()
+    stem = os.path.basename(journal.path)[:-6]
+
+    assert SessionJournal(str(tmp_path)).recover() == ["typed before the crash"]
+    assert len(read_keystrokes(tmp_path / f"{stem}.keys")) == 1
+    assert not os.listdir(journal.journal_dir)
+
+
+def test_resumed_journal_keeps_its_earlier_keys(tmp_path):
+    journal = SessionJournal(str(tmp_path))
+    recorder = KeystrokeRecorder(journal.journal_dir)
+    session = Session(clock=ManualClock(0), journal=journal, keystrokes=recorder)
+    session.start()
+    session.keystroke()
+    session.autosave("first run")
+    recorder.flush()
+    path = journal.path
+
+    # Restart: a new recorder flushes before the resumed journal's next autosave.
+    journal = SessionJournal(str(tmp_path))
+    journal.resume(path)
+    recorder = KeystrokeRecorder(journal.journal_dir)
+    session = Session(clock=ManualClock(0), journal=journal, keystrokes=recorder)
+    session.start()
+    session.keystroke()
+    recorder.flush()
+    snapshot = session.finish("first run, second run")
+    assert len(read_keystrokes(os.path.splitext(snapshot)[0] + ".keys")) == 2
+    assert not os.listdir(journal.journal_dir)
@@ -0,0 +1,26 @@
+from freewrite.persistence import PersistenceWorker
+
+
+def test_superseded_write_keeps_its_place(tmp_path):
+    path = str(tmp_path / "g.txt")
+    seen = []
+    worker = PersistenceWorker()
+    # Holding the lock keeps the writer thread from starting on the queue.
+    with worker._cond:
+        worker.write(path, "first")
+        worker.call(lambda: seen.append(open(path).read()))
+        worker.write(path, "second")
+    worker.close()
+    assert seen == ["second"]
+    assert open(path).read() == "second"
+
+
+def test_append_after_pending_remove_writes_only_the_tail(tmp_path):
+    path = tmp_path / "j.txt"
+    path.write_text("OLD")
+    worker = PersistenceWorker()
+    with worker._cond:
+        worker.remove(str(path))
+        worker.append(str(path), "new")
+    worker.close()
+    assert path.read_text() == "new"
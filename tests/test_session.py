@@ -0,0 +1,80 @@
+import time
+
+from freewrite.core import ManualClock, Session, SessionTimer
+from freewrite.journal import SessionJournal
+
+
+def test_loaded_text_is_not_journaled_until_typing_starts(tmp_path):
+    journal = SessionJournal(str(tmp_path))
+    session = Session(clock=ManualClock(0), journal=journal)
+    assert not session.autosave("an old draft, opened for reading")
+    assert session.finish("an old draft, opened for reading") is None
+    session.start()
+    assert session.autosave("an old draft, opened for reading, and more")
+    assert session.finish("an old draft, opened for reading, and more") is not None
+
+
+class FakeScheduler:
+    def __init__(self):
+        self.pending = {}
+        self.next_id = 0
+
+    def schedule(self, ms, func):
+        self.next_id += 1
+        self.pending[self.next_id] = (ms, func)
+        return self.next_id
+
+    def cancel(self, after_id):
+        del self.pending[after_id]
+
+    def run_next(self, clock, late=0.0):
+        (after_id, (ms, func)), = self.pending.items()
+        del self.pending[after_id]
+        clock.advance(ms / 1000 + late)
+        func()
+        return ms
+
+
+def test_ticks_stay_on_second_boundaries_when_callbacks_run_late():
+    clock = ManualClock(100.0)
+    session = Session(length_minutes=1, clock=clock)
+    scheduler = FakeScheduler()
+    SessionTimer(session, scheduler.schedule, scheduler.cancel)
+    ticks = []
+    session.subscribe("tick", ticks.append)
+    session.start()
+    assert scheduler.run_next(clock, late=0.25) == 1000
+    # 1.25 s in: the next change of the display is 0.75 s away, not 1 s.
+    assert scheduler.run_next(clock) == 750
+    assert scheduler.run_next(clock, late=0.125) == 1000
+    assert scheduler.run_next(clock) == 875
+    assert ticks == [59, 58, 57, 56]
+
+
+def test_paused_time_is_not_counted():
+    clock = ManualClock(0.0)
+    session = Session(length_minutes=15, clock=clock)
+    scheduler = FakeScheduler()
+    SessionTimer(session, scheduler.schedule, scheduler.cancel)
+    session.start()
+    clock.advance(10.5)
+    session.toggle_pause()
+    assert not scheduler.pending
+    clock.advance(3600)
+    assert session.remaining() == 15 * 60 - 10
+    session.toggle_pause()
+    assert session.remaining() == 15 * 60 - 10
+    assert scheduler.run_next(clock) == 500
+    assert session.remaining() == 15 * 60 - 11
+
+
+def test_wall_clock_jump_does_not_change_remaining(monkeypatch):
+    clock = ManualClock(0.0)
+    session = Session(length_minutes=15, clock=clock)
+    session.start()
+    clock.advance(30)
+    before = session.remaining()
+    wall = time.time()
+    monkeypatch.setattr(time, "time", lambda: wall + 6 * 3600)
+    assert session.remaining() == before == 15 * 60 - 30
+    assert session.tick() == before
@@ -0,0 +1,41 @@
+import random
+
+from freewrite.wordcount import WordCounter, count_words, count_words_stream
+
+ALPHABET = "ab  \n\t.,"
+
+
+def random_text(rng, max_len):
+    return "".join(rng.choice(ALPHABET) for _ in range(rng.randint(0, max_len)))
+
+
+def test_incremental_edits_match_split():
+    rng = random.Random(1234)
+    for _ in range(200):
+        text = random_text(rng, 40)
+        counter = WordCounter(text)
+        for _ in range(50):
+            if text and rng.random() < 0.4:
+                start = rng.randrange(len(text))
+                end = rng.randint(start + 1, min(len(text), start + 8))
+                prev = text[start - 1] if start else ""
+                next_char = text[end] if end < len(text) else ""
+                counter.delete(prev, text[start:end], next_char)
+                text = text[:start] + text[end:]
+            else:
+                pos = rng.randint(0, len(text))
+                run = random_text(rng, 8)
+                prev = text[pos - 1] if pos else ""
+                next_char = text[pos] if pos < len(text) else ""
+                counter.insert(prev, run, next_char)
+                text = text[:pos] + run + text[pos:]
+            assert counter.count == len(text.split()), repr(text)
+
+
+def test_stream_matches_split_at_any_chunking():
+    rng = random.Random(99)
+    for _ in range(300):
+        text = random_text(rng, 60)
+        cuts = sorted(rng.sample(range(len(text) + 1), min(len(text) + 1, rng.randint(0, 6))))
+        chunks = [text[a:b] for a, b in zip([0] + cuts, cuts + [len(text)])]
+        assert count_words_stream(chunks) == count_words(text) == len(text.split())